@@ -223,30 +223,47 @@ class AggregateShare(models.Model):
 
 class ConfigurationManager(models.Manager):
 
+    def get_value(self, key, configurations):
+        """
+        converts stored value of key to its type.
+        :param key: configuration key
+        :param configurations: dict of configuration keys to stored values
+        :return: converted value or default value if key is not stored or not compatible with its type
+        """
+        if key in configurations:
+            val = configurations[key]
+            val_type = CONFIGURATION_KEY_TO_TYPE[key]
+
+            # trying to convert value to value_type
+            try:
+                val = locate(val_type)(val)
+                return val
+
+            except:
+                # failed to convert, return default value
+                logger.error('Problem in configuration; {} with value {} is not compatible with type {}'
+                             .format(key, val, val_type))
+                return CONFIGURATION_DEFAULT_KEY_VALUE[key]
+
+        return CONFIGURATION_DEFAULT_KEY_VALUE[key]
+
+    def snapshot(self, *keys):
+        """
+        reads given configurations with one query, to be used when several keys are needed together.
+        :param keys: configuration keys to be read
+        :return: frozendict of given configuration keys to values
+        """
+        configurations = dict(self.filter(key__in=keys).values_list('key', 'value'))
+        return frozendict({key: self.get_value(key, configurations) for key in keys})
+
     def __getattr__(self, attr):
         """
         overriding __gerattr__ to create new 2 attributes for Configuration.object based on KEY_CHOICES.
         :param attr:
         :return:
         """
-        if attr in [key for (key, temp) in CONFIGURATION_KEY_CHOICE]:
-            configurations = dict(self.all().values_list('key', 'value'))
-            if attr in configurations:
-                val = configurations[attr]
-                val_type = CONFIGURATION_KEY_TO_TYPE[attr]
-
-                # trying to convert value to value_type
-                try:
-                    val = locate(val_type)(val)
-                    return val
-
-                except:
-                    # failed to convert, return default value
-                    logger.error('Problem in configuration; {} with value {} is not compatible with type {}'
-                                 .format(attr, val, val_type))
-                    return CONFIGURATION_DEFAULT_KEY_VALUE[attr]
-
-            return CONFIGURATION_DEFAULT_KEY_VALUE[attr]
+        if attr in CONFIGURATION_KEY_TO_TYPE:
+            return self.get_value(attr, dict(self.all().values_list('key', 'value')))
 
         else:
             return super(ConfigurationManager, self).__getattribute__(attr)
@@ -31,8 +31,10 @@ class ShareSerializer(serializers.ModelSerializer):
         if not validated_data.get('miner').ip == client_ip:
             validated_data.get('miner').ip = client_ip
             validated_data.get('miner').save()
-        obj, exist = MinerIP.objects.get_or_create(miner=validated_data.get('miner'), ip=client_ip)
-        obj.save()
+        obj, created = MinerIP.objects.get_or_create(miner=validated_data.get('miner'), ip=client_ip)
+        # updating updated_at field, a new object already has it
+        if not created:
+            obj.save()
 
         return super(ShareSerializer, self).create(validated_data)
 
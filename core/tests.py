@@ -1,3 +1,6 @@
+import copy
+import functools
+import itertools
 import json
 import os
 import random
@@ -5,12 +8,12 @@ import string
 import uuid
 from datetime import timedelta, datetime
 from pydoc import locate
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse
 
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import Sum, Max
-from django.test import TestCase, Client, TransactionTestCase, override_settings
+from django.db.models import Sum, Count
+from django.test import TestCase, override_settings
 from django.test.client import RequestFactory
 from django.utils import timezone
 from django.utils.timezone import get_current_timezone
@@ -28,16 +31,87 @@ from core.utils import RewardAlgorithm, get_miner_payment_address
 from core.views import TOTPDeviceViewSet
 
 
+LETTERS = string.ascii_lowercase + string.ascii_uppercase + string.digits
+# public keys of miners in withdrawal and maturity tests, only need to be distinct
+MINER_PUBLIC_KEYS = tuple('pk{:02d}'.format(i) for i in range(10))
+CONFIGURATION_KEYS = tuple(key for key, label in CONFIGURATION_KEY_CHOICE)
+# value of every configuration key when all of them are stored as '1'
+CONFIGURATION_VALUES_OF_ONE = {key: locate(CONFIGURATION_KEY_TO_TYPE[key])('1') for key in CONFIGURATION_KEYS}
+unique_counter = itertools.count()
+
+
 def random_string(length=10):
     """Generate a random string of fixed length """
-    letters = string.ascii_lowercase + string.ascii_uppercase + string.digits
-    return ''.join(random.choice(letters) for _ in range(length))
+    return ''.join(random.choice(LETTERS) for _ in range(length))
 
 
-class ShareTestCase(TestCase):
+def unique_string(prefix='u'):
+    """Generate a unique string for fixtures that only need to be distinct """
+    return '{}{:010d}'.format(prefix, next(unique_counter))
+
+
+@functools.lru_cache(maxsize=None)
+def read_test_data(name):
+    """
+    parse a json file of core/data_testing once per test run
+    :param name: file name
+    :return: parsed content, must not be changed, use load_test_data to get a copy
+    """
+    with open(os.path.join("core/data_testing", name), "r") as read_file:
+        return json.load(read_file)
+
+
+def load_test_data(name):
+    """
+    :param name: file name in core/data_testing
+    :return: a copy of parsed content that can be changed by the test
+    """
+    return copy.deepcopy(read_test_data(name))
+
+
+def get_balance_counts(**filters):
+    """
+    count filtered balances of each miner and amount in one query
+    :param filters: filters of balances
+    :return: dict of (miner public key, balance) to number of balances
+    """
+    balances = Balance.objects.filter(**filters).values_list('miner__public_key', 'balance').annotate(Count('id'))
+    return {(miner, balance): count for miner, balance, count in balances}
+
+
+def get_aggregate_share_counts(**filters):
+    """
+    count filtered aggregate shares of each miner in one query
+    :param filters: filters of aggregate shares
+    :return: dict of miner public key to number of aggregate shares
+    """
+    return dict(AggregateShare.objects.filter(**filters).values_list('miner__public_key').annotate(Count('id')))
+
+
+def set_configuration(key, value):
+    """
+    store value of a configuration key, updating it if it already exists
+    :param key: configuration key
+    :param value: value of the key
+    :return:
+    """
+    Configuration.objects.update_or_create(key=key, defaults={'value': str(value)})
+
+
+class JSONAPIClient(APIClient):
+    """
+    api client which encodes request data as json when no format or content type is given
+    """
+    default_format = 'json'
+
+
+class SharePropCallTestCase(TestCase):
+    """
+    test calling reward algorithm on receiving a share, reward algorithm is mocked and no fixture is needed.
+    view still creates miner and share so these tests can not be SimpleTestCase.
+    """
+
     def setUp(self):
-        self.client = Client()
-        Miner.objects.create(public_key="2", nick_name="Parsa")
         self.addresses = {
             'miner_address': random_string(),
             'lock_address': random_string(),
@@ -79,23 +153,74 @@ class ShareTestCase(TestCase):
             Address.objects.filter(address_miner__public_key='1', address=self.addresses['withdraw_address'],
                                    category='withdraw').count(), 0)
 
+
+class ShareTestCase(TestCase):
+    # a complete solved share, tests override or exclude fields of it
+    SHARE_DATA = {
+        'miner': '1',
+        'nonce': '1',
+        'transaction_id': 'this is a transaction id',
+        'block_height': 40404,
+        'status': 'solved',
+        'pow_identity': 'test',
+        'parent_id': 'test',
+        'next_ids': [],
+        'client_ip': '127.0.0.5',
+        'path': '-1',
+        'difficulty': 123456
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        Miner.objects.create(public_key="2", nick_name="Parsa")
+        cls.addresses = {
+            'miner_address': random_string(),
+            'lock_address': random_string(),
+            'withdraw_address': random_string()
+        }
+
+    def get_share_data(self, exclude=(), **kwargs):
+        """
+        build data of a share request from SHARE_DATA and addresses
+        :param exclude: fields to be removed from data
+        :param kwargs: fields to be overridden
+        :return: data of share request
+        """
+        data = dict(self.SHARE_DATA)
+        data.update(self.addresses)
+        data.update(kwargs)
+        for field in exclude:
+            del data[field]
+        return data
+
+    def create_addresses(self):
+        """
+        create miner, lock and withdraw addresses of miner '2' in one query
+        :return: last_used of miner, lock and withdraw addresses
+        """
+        miner = Miner.objects.get(public_key='2')
+        addresses = Address.objects.bulk_create([
+            Address(address_miner=miner, address=self.addresses[category + '_address'], category=category)
+            for category in ['miner', 'lock', 'withdraw']
+        ])
+        return [address.last_used for address in addresses]
+
+    def get_addresses_last_used(self):
+        """
+        fetch last_used of all addresses of miner '2' in one query
+        :return: dict of (category, address) to last_used
+        """
+        addresses = Address.objects.filter(address_miner__public_key='2') \
+            .values_list('category', 'address', 'last_used')
+        return {(category, address): last_used for category, address, last_used in addresses}
+
     def test_solved_share_without_transaction_id(self):
         """
         test if a solution submitted without transaction id no solution must store in database
         :return:
         """
         share = uuid.uuid4().hex
-        data = {'share': share,
-                'miner': '1',
-                'nonce': '1',
-                'status': 'solved',
-                'pow_identity': "test",
-                'parent_id': 'test',
-                'next_ids': [],
-                'client_ip': '127.0.0.5',
-                'path': '-1',
-                'difficulty': 123456}
-        data.update(self.addresses)
+        data = self.get_share_data(share=share, exclude=['transaction_id', 'block_height'])
         self.client.post('/shares/', data, format='json')
         self.assertFalse(Share.objects.filter(share=share).exists())
 
@@ -105,18 +230,7 @@ class ShareTestCase(TestCase):
         :return:
         """
         share = uuid.uuid4().hex
-        data = {'share': share,
-                'miner': '1',
-                'nonce': '1',
-                "transaction_id": "this is a transaction id",
-                'status': 'solved',
-                'pow_identity': "test",
-                'parent_id': 'test',
-                'next_ids': [],
-                'client_ip': '127.0.0.5',
-                'path': '-1',
-                'difficulty': 123456}
-        data.update(self.addresses)
+        data = self.get_share_data(share=share, exclude=['block_height'])
         self.client.post('/shares/', data, format='json')
         self.assertFalse(Share.objects.filter(share=share).exists())
 
@@ -126,17 +240,7 @@ class ShareTestCase(TestCase):
         :return:
         """
         share = uuid.uuid4().hex
-        data = {'share': share,
-                'miner': '1',
-                'nonce': '1',
-                "transaction_id": "this is a transaction id",
-                'status': 'valid',
-                "block_height": 40404,
-                'next_ids': [],
-                'client_ip': '127.0.0.5',
-                'path': '-1',
-                'difficulty': 123456}
-        data.update(self.addresses)
+        data = self.get_share_data(share=share, status='valid', exclude=['parent_id', 'pow_identity'])
         self.client.post('/shares/', data, format='json')
         self.assertFalse(Share.objects.filter(share=share).exists())
 
@@ -146,17 +250,7 @@ class ShareTestCase(TestCase):
         :return:
         """
         share = uuid.uuid4().hex
-        data = {'share': share,
-                'miner': '1',
-                'nonce': '1',
-                "transaction_id": "this is a transaction id",
-                'status': 'valid',
-                "block_height": 40404,
-                'parent_id': 'test',
-                'next_ids': [],
-                'client_ip': '127.0.0.5',
-                'difficulty': 123456}
-        data.update(self.addresses)
+        data = self.get_share_data(share=share, status='valid', exclude=['path', 'pow_identity'])
         self.client.post('/shares/', data, format='json')
         self.assertFalse(Share.objects.filter(share=share).exists())
 
@@ -166,18 +260,7 @@ class ShareTestCase(TestCase):
         :return:
         """
         share = uuid.uuid4().hex
-        data = {"share": share,
-                'miner': '1',
-                'nonce': '1',
-                "transaction_id": "this is a transaction id",
-                "block_height": 40404,
-                'status': 'solved',
-                'parent_id': 'test',
-                'next_ids': ['test'],
-                'client_ip': '127.0.0.1',
-                'path': '-1',
-                'difficulty': 123456}
-        data.update(self.addresses)
+        data = self.get_share_data(share=share, next_ids=['test'], client_ip='127.0.0.1', exclude=['pow_identity'])
         self.client.post('/shares/', data, format='json')
         self.assertFalse(Share.objects.filter(share=share).exists())
 
@@ -187,42 +270,16 @@ class ShareTestCase(TestCase):
         :return:
         """
         share = uuid.uuid4().hex
-        data = {"share": share,
-                "miner": "1",
-                "nonce": "1",
-                "transaction_id": "this is a transaction id",
-                "block_height": 40404,
-                "status": "solved",
-                "pow_identity": "test",
-                "parent_id": "test",
-                "next_ids": ["test"],
-                "client_ip": "127.0.0.5",
-                "path": "-1",
-                "difficulty": 123456,
-                "withdraw_address": "test",
-                "miner_address": "test",
-                "lock_address": "test"
-                }
-        data.update(self.addresses)
+        data = self.get_share_data(share=share, next_ids=['test'])
         self.client.post('/shares/', data, format='json')
 
-        data = {"share": share + 'bhkk',
-                'miner': '1',
-                'nonce': '1',
-                "transaction_id": "gffdthis is a transaction id",
-                "block_height": 404054,
-                'status': 'solved',
-                'pow_identity': "test",
-                'parent_id': 'test',
-                'next_ids': ['test'],
-                'client_ip': '127.0.0.1',
-                'path': '-1',
-                'difficulty': 123456}
-        data.update(self.addresses)
+        data = self.get_share_data(share=share + 'bhkk', transaction_id='gffdthis is a transaction id',
+                                   block_height=404054, next_ids=['test'], client_ip='127.0.0.1')
         self.client.post('/shares/', data, format='json')
 
-        self.assertTrue(Share.objects.filter(share=share).exists())
-        self.assertTrue(Share.objects.filter(parent_id='test').exists())
+        shares = dict(Share.objects.filter(share__in=[share, share + 'bhkk']).values_list('share', 'parent_id'))
+        self.assertIn(share, shares)
+        self.assertIn('test', shares.values())
         self.assertTrue(MinerIP.objects.filter(ip='127.0.0.1').exists())
 
     def test_valid_share_without_block_height(self):
@@ -231,16 +288,8 @@ class ShareTestCase(TestCase):
         :return:
         """
         share = uuid.uuid4().hex
-        data = {'share': share,
-                'miner': '1',
-                'nonce': '1',
-                'status': 'valid',
-                'parent_id': 'test',
-                'next_ids': [],
-                'client_ip': '127.0.0.5',
-                'path': '-1',
-                'difficulty': 123456}
-        data.update(self.addresses)
+        data = self.get_share_data(share=share, status='valid',
+                                   exclude=['transaction_id', 'block_height', 'pow_identity'])
         self.client.post('/shares/', data, format='json')
         self.assertFalse(Share.objects.filter(share=share).exists())
 
@@ -252,19 +301,7 @@ class ShareTestCase(TestCase):
         share = uuid.uuid4().hex
         miner = Miner.objects.get(public_key="2")
         client = MinerIP.objects.create(miner=miner, ip='127.0.0.1')
-        data = {"share": share,
-                'miner': '2',
-                'nonce': '1',
-                "transaction_id": "this is a transaction id",
-                "block_height": 40404,
-                'status': 'solved',
-                'pow_identity': "test",
-                'parent_id': 'test',
-                'next_ids': ['test'],
-                'client_ip': '127.0.0.1',
-                'path': '-1',
-                'difficulty': 123456}
-        data.update(self.addresses)
+        data = self.get_share_data(share=share, miner='2', next_ids=['test'], client_ip='127.0.0.1')
         self.client.post('/shares/', data, format='json')
         client_update = MinerIP.objects.filter(miner=miner)[0].updated_at
         self.assertGreater(client_update, client.updated_at)
@@ -277,19 +314,7 @@ class ShareTestCase(TestCase):
         share = uuid.uuid4().hex
         miner = Miner.objects.get(public_key="2")
         MinerIP.objects.create(miner=miner, ip='127.0.0.1')
-        data = {"share": share,
-                'miner': '2',
-                'nonce': '1',
-                "transaction_id": "this is a transaction id",
-                "block_height": 40404,
-                'status': 'solved',
-                'pow_identity': "test",
-                'parent_id': 'test',
-                'next_ids': ['test'],
-                'client_ip': '127.0.0.2',
-                'path': '-1',
-                'difficulty': 123456}
-        data.update(self.addresses)
+        data = self.get_share_data(share=share, miner='2', next_ids=['test'], client_ip='127.0.0.2')
         self.client.post('/shares/', data, format='json')
         self.assertEqual(MinerIP.objects.filter(miner=miner).count(), 2)
 
@@ -298,58 +323,47 @@ class ShareTestCase(TestCase):
         test if a non-solution submitted share must store with None in transaction_id
         addresses are present, last_used field must be updated
         """
-        miner_last_used = Address.objects.create(address_miner=Miner.objects.get(public_key='2'),
-                                                 address=self.addresses['miner_address'], category='miner').last_used
-        lock_last_used = Address.objects.create(address_miner=Miner.objects.get(public_key='2'),
-                                                address=self.addresses['lock_address'], category='lock').last_used
-        withdraw_last_used = Address.objects.create(address_miner=Miner.objects.get(public_key='2'),
-                                                    address=self.addresses['withdraw_address'],
-                                                    category='withdraw').last_used
+        miner_last_used, lock_last_used, withdraw_last_used = self.create_addresses()
         share = uuid.uuid4().hex
-        data = {'share': share,
-                'miner': '2',
-                'nonce': '1',
-                "transaction_id": "this is a transaction id",
-                "block_height": 40404,
-                'parent_id': 'test',
-                'next_ids': [],
-                'client_ip': '127.0.0.1',
-                'path': '-1',
-                'status': 'valid',
-                'difficulty': 123456,
-                "pow_identity": "test"}
-        data.update(self.addresses)
+        data = self.get_share_data(share=share, miner='2', client_ip='127.0.0.1', status='valid')
         self.client.post('/shares/', data, format='json')
         self.assertEqual(Share.objects.filter(share=share).count(), 1)
         transaction = Share.objects.filter(share=share).first()
         self.assertIsNone(transaction.transaction_id)
-        self.assertEqual(Address.objects.filter(address_miner__public_key='2', address=self.addresses['miner_address'],
-                                                category='miner').count(), 1)
-        self.assertEqual(Address.objects.filter(address_miner__public_key='2', address=self.addresses['lock_address'],
-                                                category='lock').count(), 1)
-        self.assertEqual(
-            Address.objects.filter(address_miner__public_key='2', address=self.addresses['withdraw_address'],
-                                   category='withdraw').count(), 1)
-        self.assertTrue(Address.objects.filter(address_miner__public_key='2', address=self.addresses['miner_address'],
-                                               category='miner').first().last_used > miner_last_used)
-        self.assertEqual(Address.objects.filter(address_miner__public_key='2', address=self.addresses['lock_address'],
-                                                category='lock').first().last_used, lock_last_used)
-        self.assertEqual(
-            Address.objects.filter(address_miner__public_key='2', address=self.addresses['withdraw_address'],
-                                   category='withdraw').first().last_used, withdraw_last_used)
+        last_used = self.get_addresses_last_used()
+        self.assertEqual(len(last_used), 3)
+        self.assertTrue(last_used[('miner', self.addresses['miner_address'])] > miner_last_used)
+        self.assertEqual(last_used[('lock', self.addresses['lock_address'])], lock_last_used)
+        self.assertEqual(last_used[('withdraw', self.addresses['withdraw_address'])], withdraw_last_used)
+
+    def test_invalid_share_num_queries(self):
+        """
+        test number of queries for storing an invalid share of an existing miner
+        """
+        data = self.get_share_data(share=uuid.uuid4().hex, miner='2', client_ip='127.0.0.1', status='invalid',
+                                   exclude=['transaction_id', 'block_height', 'pow_identity'])
+        with self.assertNumQueries(8):
+            response = self.client.post('/shares/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @patch('core.utils.RewardAlgorithm.get_instance')
+    def test_valid_share_new_addresses_num_queries(self, mocked_get_instance):
+        """
+        test number of queries for storing a valid share of an existing miner with new addresses
+        """
+        data = self.get_share_data(share=uuid.uuid4().hex, miner='2', client_ip='127.0.0.1', status='valid',
+                                   exclude=['transaction_id'])
+        with self.assertNumQueries(20):
+            response = self.client.post('/shares/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(mocked_get_instance.called)
 
     def test_validate_invalid_share_do_not_update_last_used(self):
         """
         test if a non-solution submitted share must store with None in transaction_id and block_height
         addresses are present, last_used field must be updated
         """
-        miner_last_used = Address.objects.create(address_miner=Miner.objects.get(public_key='2'),
-                                                 address=self.addresses['miner_address'], category='miner').last_used
-        lock_last_used = Address.objects.create(address_miner=Miner.objects.get(public_key='2'),
-                                                address=self.addresses['lock_address'], category='lock').last_used
-        withdraw_last_used = Address.objects.create(address_miner=Miner.objects.get(public_key='2'),
-                                                    address=self.addresses['withdraw_address'],
-                                                    category='withdraw').last_used
+        miner_last_used, lock_last_used, withdraw_last_used = self.create_addresses()
         share = uuid.uuid4().hex
         data = {'share': share,
                 'miner': '2',
@@ -358,27 +372,11 @@ class ShareTestCase(TestCase):
                 }
         data.update(self.addresses)
         self.client.post('/shares/', data, format='json')
-        self.assertEqual(Address.objects.filter(address_miner__public_key='2', address=self.addresses['miner_address'],
-                                                category='miner').count(), 1)
-        self.assertEqual(Address.objects.filter(address_miner__public_key='2', address=self.addresses['lock_address'],
-                                                category='lock').count(), 1)
-        self.assertEqual(
-            Address.objects.filter(address_miner__public_key='2', address=self.addresses['withdraw_address'],
-                                   category='withdraw').count(), 1)
-        self.assertTrue(Address.objects.filter(address_miner__public_key='2', address=self.addresses['miner_address'],
-                                               category='miner').first().last_used == miner_last_used)
-        self.assertTrue(Address.objects.filter(address_miner__public_key='2', address=self.addresses['lock_address'],
-                                               category='lock').first().last_used == lock_last_used)
-        self.assertTrue(
-            Address.objects.filter(address_miner__public_key='2', address=self.addresses['withdraw_address'],
-                                   category='withdraw').first().last_used == withdraw_last_used)
-
-    def tearDown(self):
-        Address.objects.all().delete()
-        Miner.objects.all().delete()
-        Share.objects.all().delete()
-        Balance.objects.all().delete()
-        Configuration.objects.all().delete()
+        last_used = self.get_addresses_last_used()
+        self.assertEqual(len(last_used), 3)
+        self.assertEqual(last_used[('miner', self.addresses['miner_address'])], miner_last_used)
+        self.assertEqual(last_used[('lock', self.addresses['lock_address'])], lock_last_used)
+        self.assertEqual(last_used[('withdraw', self.addresses['withdraw_address'])], withdraw_last_used)
 
 
 class PropFunctionTest(TestCase):
@@ -388,7 +386,8 @@ class PropFunctionTest(TestCase):
     So in other situations the results may not be valid.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         create 5 miners and 33 shares.
         share indexes [14, 34, 35] are solved (indexes are from 0) odd indexes are invalid other are valid
@@ -400,23 +399,26 @@ class PropFunctionTest(TestCase):
         Configuration.objects.create(key='FEE_FACTOR', value='0')
         Configuration.objects.create(key='REWARD_FACTOR', value=str(65 / 67.5))
         # create miners lists
-        miners = [Miner.objects.create(nick_name="miner %d" % i, public_key=str(i)) for i in range(3)]
+        miners = Miner.objects.bulk_create([Miner(nick_name="miner %d" % i, public_key=str(i)) for i in range(3)])
         # create shares list
-        shares = [Share.objects.create(
+        shares = Share.objects.bulk_create([Share(
             share=str(i),
             miner=miners[i % 3],
             status="solved" if i in [14, 34, 35] else "valid" if i % 2 == 0 else "invalid",
             difficulty=1000
-        ) for i in range(36)]
-        # set create date for each shares to make them a sequence valid
+        ) for i in range(36)])
+        # set create date for each shares to make them a sequence valid,
+        # auto_now_add overrides created_at on insert so it is updated afterwards
         start_date = timezone.now() + timedelta(seconds=-100)
-        for share in shares:
-            share.created_at = start_date
-            share.save()
-            start_date += timedelta(seconds=1)
-        self.miners = miners
-        self.shares = shares
-        self.prop = RewardAlgorithm.get_instance().perform_logic
+        for i, share in enumerate(shares):
+            share.created_at = start_date + timedelta(seconds=i)
+        Share.objects.bulk_update(shares, ['created_at'])
+        cls.miners = miners
+        cls.shares = shares
+        cls.algorithm = RewardAlgorithm.get_instance()
+
+    def setUp(self):
+        self.prop = self.algorithm.perform_logic
 
     def test_prop_with_0_solved_share(self):
         """
@@ -486,23 +488,21 @@ class PropFunctionTest(TestCase):
         so in second call balances must be changed
         :return:
         """
-        Configuration.objects.create(key='MAX_REWARD', value=int(65e9))
+        set_configuration('MAX_REWARD', int(65e9))
         share = self.shares[34]
         self.prop(share)
         balances = self.get_share_balance(share)
         self.assertEqual(balances, {'0': int(19.5e9), '1': int(26.0e9), '2': int(19.5e9)})
 
-        cur = Share.objects.create(miner=Miner.objects.get(public_key='1'), status='valid', difficulty=10000)
+        cur = Share.objects.create(miner=self.miners[1], status='valid', difficulty=10000)
         cur.created_at = share.created_at - timedelta(seconds=1)
         cur.save()
         self.prop(share)
         cur_balances = self.get_share_balance(share)
         self.assertEqual(cur_balances, {'0': int(9.75e9), '1': int(45.5e9), '2': int(9.75e9)})
+        balance_counts = get_balance_counts(status='immature', share=share)
         for miner_id in cur_balances:
-            balance = Balance.objects.filter(miner__public_key=miner_id,
-                                             balance=cur_balances[miner_id] - balances[miner_id],
-                                             status='immature', share=share)
-            self.assertEqual(balance.count(), 1)
+            self.assertEqual(balance_counts.get((miner_id, cur_balances[miner_id] - balances[miner_id])), 1)
 
     def test_prop_with_first_solved_share_with_fee(self):
         """
@@ -511,8 +511,8 @@ class PropFunctionTest(TestCase):
 
         :return:
         """
-        reward = RewardAlgorithm.get_instance().get_reward_to_share()
-        Configuration.objects.filter(key='FEE_FACTOR').update(value=str(10e9 / reward))
+        reward = self.algorithm.get_reward_to_share()
+        set_configuration('FEE_FACTOR', 10e9 / reward)
         share = self.shares[14]
         self.prop(share)
         balances = self.get_share_balance(share)
@@ -524,8 +524,8 @@ class PropFunctionTest(TestCase):
         in this case we have 9 valid share 9 invalid share and one solved share.
         :return:
         """
-        reward = RewardAlgorithm.get_instance().get_reward_to_share()
-        Configuration.objects.create(key='FEE_FACTOR', value=str(10e9 / reward))
+        reward = self.algorithm.get_reward_to_share()
+        set_configuration('FEE_FACTOR', 10e9 / reward)
         share = self.shares[34]
         self.prop(share)
         balances = self.get_share_balance(share)
@@ -537,8 +537,8 @@ class PropFunctionTest(TestCase):
         in this case we only have one share and reward must be minimum of MAX_REWARD and TOTAL_REWARD
         :return:
         """
-        reward = RewardAlgorithm.get_instance().get_reward_to_share()
-        Configuration.objects.create(key='FEE_FACTOR', value=str(10e9 / reward))
+        reward = self.algorithm.get_reward_to_share()
+        set_configuration('FEE_FACTOR', 10e9 / reward)
         share = self.shares[35]
         self.prop(share)
         balances = self.get_share_balance(share)
@@ -551,9 +551,8 @@ class PropFunctionTest(TestCase):
         in this case we call prop function 5 times. after each call balance for each miner must be same as expected
         :return:
         """
-        reward = RewardAlgorithm.get_instance().get_reward_to_share()
-        Configuration.objects.filter(key='FEE_FACTOR').delete()
-        Configuration.objects.create(key='FEE_FACTOR', value=str(10e9 / reward))
+        reward = self.algorithm.get_reward_to_share()
+        set_configuration('FEE_FACTOR', 10e9 / reward)
         share = self.shares[34]
         for i in range(5):
             self.prop(share)
@@ -565,7 +564,7 @@ class PropFunctionTest(TestCase):
         same scenario as first_solved_share but with different difficulties
         """
         share = self.shares[14]
-        miner = Miner.objects.get(public_key='0')
+        miner = self.miners[0]
         Share.objects.filter(miner=miner).delete()
         others_difficulty = Share.objects.filter(created_at__lte=share.created_at, miner__public_key__in=['1', '2'],
                                                  status__in=['solved', 'valid']) \
@@ -583,9 +582,9 @@ class PropFunctionTest(TestCase):
         """
         same scenario as between_two_solved_shares but with different difficulties
         """
-        Configuration.objects.create(key='MAX_REWARD', value=int(65e9))
+        set_configuration('MAX_REWARD', int(65e9))
         share = self.shares[34]
-        miner = Miner.objects.get(public_key='1')
+        miner = self.miners[1]
         Share.objects.filter(miner=miner).update(difficulty=0)
         others_difficulty = Share.objects.filter(created_at__lte=share.created_at,
                                                  created_at__gt=self.shares[14].created_at,
@@ -600,16 +599,6 @@ class PropFunctionTest(TestCase):
         val = 65. / 3
         self.assertEqual(balances, {'0': int(val * 0.5e9), '1': int(val * 2e9), '2': int(val * 0.5e9)})
 
-    def tearDown(self):
-        """
-        tearDown function to delete miners created in setUp function
-        :return:
-        """
-        Configuration.objects.all().delete()
-        Balance.objects.all().delete()
-        Share.objects.all().delete()
-        Miner.objects.all().delete()
-
 
 class UserApiTestCase(TestCase):
     def setUp(self) -> None:
@@ -617,22 +606,19 @@ class UserApiTestCase(TestCase):
         Configuration.objects.create(key='MIN_WITHDRAW_THRESHOLD', value=str(int(1e9)))
 
         # creating 10 miners
-        pks = [random_string().lower() for _ in range(10)]
-        for pk in pks:
-            Miner.objects.create(public_key=pk)
-
-        self.miners = list(Miner.objects.all())
+        pks = [unique_string() for _ in range(10)]
+        self.miners = Miner.objects.bulk_create([Miner(public_key=pk) for pk in pks])
         # by default every miner has 80 erg balance
-        for miner in Miner.objects.all():
-            Balance.objects.create(miner=miner, balance=int(100e9), status="mature")
-            Balance.objects.create(miner=miner, balance=int(-20e9), status="withdraw")
-
-        self.balances = list(Balance.objects.all())
+        balances = []
+        for miner in self.miners:
+            balances += [Balance(miner=miner, balance=int(100e9), status="mature"),
+                         Balance(miner=miner, balance=int(-20e9), status="withdraw")]
+        self.balances = Balance.objects.bulk_create(balances)
 
         self.factory = RequestFactory()
         User.objects.create_user(username='test', password='test')
 
-        self.client = APIClient()
+        self.client = JSONAPIClient()
         self.client.login(username='test', password='test')
 
         # Create two miner; abc and xyz
@@ -645,20 +631,20 @@ class UserApiTestCase(TestCase):
         self.now = datetime.now()
 
         # Create shares
-        shares = [
-            Share.objects.create(share=random_string(), miner=cur_miners[0], status="solved",
-                                 created_at=self.now, difficulty=1000),
-            Share.objects.create(share=random_string(), miner=cur_miners[0], status="valid",
-                                 created_at=self.now + timedelta(minutes=1), difficulty=98761234),
-            Share.objects.create(share=random_string(), miner=cur_miners[0], status="valid",
-                                 created_at=self.now + timedelta(minutes=2), difficulty=54329876),
-            Share.objects.create(share=random_string(), miner=cur_miners[0], status="invalid",
-                                 created_at=self.now + timedelta(minutes=3), difficulty=1000),
-            Share.objects.create(share=random_string(), miner=cur_miners[1], status="valid",
-                                 created_at=self.now + timedelta(minutes=4), difficulty=1234504321),
-            Share.objects.create(share=random_string(), miner=cur_miners[1], status="valid",
-                                 created_at=self.now + timedelta(minutes=5), difficulty=67890987),
-        ]
+        shares = Share.objects.bulk_create([
+            Share(share=unique_string(), miner=cur_miners[0], status="solved",
+                  created_at=self.now, difficulty=1000),
+            Share(share=unique_string(), miner=cur_miners[0], status="valid",
+                  created_at=self.now + timedelta(minutes=1), difficulty=98761234),
+            Share(share=unique_string(), miner=cur_miners[0], status="valid",
+                  created_at=self.now + timedelta(minutes=2), difficulty=54329876),
+            Share(share=unique_string(), miner=cur_miners[0], status="invalid",
+                  created_at=self.now + timedelta(minutes=3), difficulty=1000),
+            Share(share=unique_string(), miner=cur_miners[1], status="valid",
+                  created_at=self.now + timedelta(minutes=4), difficulty=1234504321),
+            Share(share=unique_string(), miner=cur_miners[1], status="valid",
+                  created_at=self.now + timedelta(minutes=5), difficulty=67890987),
+        ])
 
         # base time for actions hash_rate and share
         time = datetime(2020, 1, 1, 8, 0, 20, 395985, tzinfo=timezone.utc)
@@ -666,17 +652,17 @@ class UserApiTestCase(TestCase):
         self.miner_actions = Miner.objects.create(public_key='hash', nick_name='hash')
         # Create shares for actions hash_rate, share, income
         shares_actions = [
-            Share.objects.create(share=random_string(), miner=self.miner_actions, status="solved",
+            Share.objects.create(share=unique_string(), miner=self.miner_actions, status="solved",
                                  difficulty=1000, block_height=1006),
-            Share.objects.create(share=random_string(), miner=self.miner_actions, status="solved",
+            Share.objects.create(share=unique_string(), miner=self.miner_actions, status="solved",
                                  difficulty=98761234, block_height=1005),
-            Share.objects.create(share=random_string(), miner=self.miner_actions, status="valid",
+            Share.objects.create(share=unique_string(), miner=self.miner_actions, status="valid",
                                  difficulty=54329876, block_height=1004),
-            Share.objects.create(share=random_string(), miner=self.miner_actions, status="invalid",
+            Share.objects.create(share=unique_string(), miner=self.miner_actions, status="invalid",
                                  difficulty=1000, block_height=1003),
-            Share.objects.create(share=random_string(), miner=self.miner_actions, status="solved",
+            Share.objects.create(share=unique_string(), miner=self.miner_actions, status="solved",
                                  difficulty=1234504321, block_height=1002),
-            Share.objects.create(share=random_string(), miner=self.miner_actions, status="solved",
+            Share.objects.create(share=unique_string(), miner=self.miner_actions, status="solved",
                                  difficulty=67890987, block_height=1001),
         ]
         # Set timestamp for create_at shares
@@ -694,6 +680,8 @@ class UserApiTestCase(TestCase):
         Balance.objects.create(miner=self.miner_actions, share=shares_actions[4], balance=500, status="mature")
         Balance.objects.create(miner=self.miner_actions, share=shares_actions[5], balance=600, status="mature")
 
+        # transactions of withdraw balances
+        Transaction.objects.bulk_create([Transaction(id=tx_id, tx_body='{}', inputs='') for tx_id in [1234, 765, 876]])
         balance_actions = [
             Balance.objects.create(miner=self.miner_actions, balance=-400, tx_id="1234", status="withdraw",
                                    max_height=1234),
@@ -719,22 +707,22 @@ class UserApiTestCase(TestCase):
         Balance.objects.create(miner=cur_miners[1], share=shares[5], balance=600, status="mature")
 
     def get_threshold_url(self, pk):
-        return urljoin('/user/', pk) + '/'
+        return '/user/{}/'.format(pk)
 
     def get_withdraw_url(self, pk):
-        return urljoin(urljoin('/user/', pk) + '/', 'withdraw') + '/'
+        return '/user/{}/withdraw/'.format(pk)
 
     def get_hash_rate_url(self, pk):
-        return urljoin(urljoin('/user/', pk) + '/', 'hash_rate') + '/'
+        return '/user/{}/hash_rate/'.format(pk)
 
     def get_share_url(self, pk):
-        return urljoin(urljoin('/user/', pk) + '/', 'share') + '/'
+        return '/user/{}/share/'.format(pk)
 
     def get_income_url(self, pk):
-        return urljoin(urljoin('/user/', pk) + '/', 'income') + '/'
+        return '/user/{}/income/'.format(pk)
 
     def get_payout_url(self, pk):
-        return urljoin(urljoin('/user/', pk) + '/', 'payout') + '/'
+        return '/user/{}/payout/'.format(pk)
 
     def mocked_time(*args, **kwargs):
         return datetime(2020, 1, 1, 8, 59, 20, 395985, tzinfo=timezone.utc)
@@ -846,7 +834,7 @@ class UserApiTestCase(TestCase):
             'periodic_withdrawal_amount': int(20e9)
         }
 
-        res = self.client.patch('/miner/', data, content_type='application/json')
+        res = self.client.patch('/miner/', data)
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_miner_not_valid_threshold_valid(self):
@@ -859,10 +847,11 @@ class UserApiTestCase(TestCase):
         }
 
         bef = miner.periodic_withdrawal_amount
-        res = self.client.patch('/miner/not_valid/', data, content_type='application/json')
+        res = self.client.patch('/miner/not_valid/', data)
 
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
-        self.assertEqual(bef, Miner.objects.get(public_key=miner.public_key).periodic_withdrawal_amount)
+        miner.refresh_from_db(fields=['periodic_withdrawal_amount'])
+        self.assertEqual(bef, miner.periodic_withdrawal_amount)
 
     def test_miner_valid_threshold_not_valid(self):
         """
@@ -874,10 +863,11 @@ class UserApiTestCase(TestCase):
         }
 
         bef = miner.periodic_withdrawal_amount
-        res = self.client.patch(self.get_threshold_url(miner.public_key), data, content_type='application/json')
+        res = self.client.patch(self.get_threshold_url(miner.public_key), data)
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertEqual(bef, Miner.objects.get(public_key=miner.public_key).periodic_withdrawal_amount)
+        miner.refresh_from_db(fields=['periodic_withdrawal_amount'])
+        self.assertEqual(bef, miner.periodic_withdrawal_amount)
 
     def test_miner_valid_threshold_valid(self):
         """
@@ -888,10 +878,11 @@ class UserApiTestCase(TestCase):
             'periodic_withdrawal_amount': int(20e9)
         }
 
-        res = Client().patch(self.get_threshold_url(miner.public_key), data, content_type='application/json')
+        res = self.client.patch(self.get_threshold_url(miner.public_key), data)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(int(20e9), Miner.objects.get(public_key=miner.public_key).periodic_withdrawal_amount)
+        miner.refresh_from_db(fields=['periodic_withdrawal_amount'])
+        self.assertEqual(int(20e9), miner.periodic_withdrawal_amount)
 
     def test_miner_valid_threshold_type_not_valid(self):
         """
@@ -903,10 +894,11 @@ class UserApiTestCase(TestCase):
         }
 
         bef = miner.periodic_withdrawal_amount
-        res = self.client.patch(self.get_threshold_url(miner.public_key), data, content_type='application/json')
+        res = self.client.patch(self.get_threshold_url(miner.public_key), data)
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertEqual(bef, Miner.objects.get(public_key=miner.public_key).periodic_withdrawal_amount)
+        miner.refresh_from_db(fields=['periodic_withdrawal_amount'])
+        self.assertEqual(bef, miner.periodic_withdrawal_amount)
 
     def test_get_all(self):
         """
@@ -952,17 +944,12 @@ class UserApiTestCase(TestCase):
         }
         """
 
-        self.miner_actions.delete()
-
-        for miner in self.miners:
-            miner.delete()
-
-        for balance in self.balances:
-            balance.delete()
+        # only abc and xyz must remain, balances of deleted miners are removed by cascade
+        Miner.objects.filter(pk__in=[miner.pk for miner in self.miners + [self.miner_actions]]).delete()
 
-        response = self.client.get('/user/').json()
-        with open("core/data_testing/user_api_all.json", "r") as read_file:
-            file = json.load(read_file)
+        with self.assertNumQueries(6):
+            response = self.client.get('/user/').json()
+        file = load_test_data("user_api_all.json")
         file['timestamp'] = self.now.strftime("%Y-%m-%d %H:%M:%S")
         self.assertDictEqual(response, file)
 
@@ -998,19 +985,13 @@ class UserApiTestCase(TestCase):
             }
         }
         """
-        content = self.client.get('/user/abc/')
+        with self.assertNumQueries(6):
+            content = self.client.get('/user/abc/')
         response = content.json()
-        with open("core/data_testing/user_api_specified_pk.json", "r") as read_file:
-            file = json.load(read_file)
+        file = load_test_data("user_api_specified_pk.json")
         file['timestamp'] = self.now.strftime("%Y-%m-%d %H:%M:%S")
         self.assertDictEqual(response, file)
 
-    def tearDown(self) -> None:
-        Miner.objects.all().delete()
-        Balance.objects.all().delete()
-        Share.objects.all().delete()
-        Configuration.objects.all().delete()
-
 
 class ConfigurationAPITest(TestCase):
     """
@@ -1022,12 +1003,19 @@ class ConfigurationAPITest(TestCase):
     4) type conversion test, after retrieving the value, it must be converted to valid value_type
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
-        setUp function for 'ConfigurationAPITest' class do nothing
+        create the user used by all tests
         :return:
         """
         User.objects.create_user(username='test', password='test')
+
+    def setUp(self):
+        """
+        setUp function for 'ConfigurationAPITest' class, logs in the test user
+        :return:
+        """
         self.client = APIClient()
         self.client.login(username='test', password='test')
         pass
@@ -1042,21 +1030,13 @@ class ConfigurationAPITest(TestCase):
         the json format of response be as below (a list of dictionaries).
         :return:
         """
-        # retrieve all possible keys for KEY_CHOICES
-        keys = [key for (key, temp) in CONFIGURATION_KEY_CHOICE]
-        # define expected response as an empty list
-        expected_response = dict(CONFIGURATION_DEFAULT_KEY_VALUE)
-        # create a json like dictionary for any key in keys
-        for key in keys:
-            Configuration.objects.create(key=key, value='1')
-            val_type = CONFIGURATION_KEY_TO_TYPE[key]
-            expected_response[key] = locate(val_type)('1')
+        Configuration.objects.bulk_create([Configuration(key=key, value='1') for key in CONFIGURATION_KEYS])
         # send a http 'get' request to the configuration endpoint
         response = self.client.get('/conf/')
         # check the status of the response
         self.assertEqual(response.status_code, 200)
         # check the content of the response
-        self.assertEqual(response.json(), expected_response)
+        self.assertEqual(response.json(), CONFIGURATION_VALUES_OF_ONE)
 
     def test_configuration_api_post_method_create(self):
         """
@@ -1067,10 +1047,8 @@ class ConfigurationAPITest(TestCase):
         the new configuration object exists in database with a value as below.
         :return:
         """
-        # retrieve all possible keys for KEY_CHOICES
-        keys = [key for (key, temp) in CONFIGURATION_KEY_CHOICE]
         # send http 'post' request to the configuration endpoint and validate the result
-        for key in keys:
+        for key in CONFIGURATION_KEYS:
             # send http 'post' request to the endpoint
             response = self.client.post('/conf/', {'key': key, 'value': '1'})
             # check the status of the response
@@ -1086,15 +1064,14 @@ class ConfigurationAPITest(TestCase):
         """
         create or update configuration using batch configs
         """
-        keys = [key for (key, temp) in CONFIGURATION_KEY_CHOICE]
-        Configuration.objects.create(key=keys[0], value="dummy_value")
+        Configuration.objects.create(key=CONFIGURATION_KEYS[0], value="dummy_value")
         batch = {}
-        for ind, key in enumerate(keys):
+        for ind, key in enumerate(CONFIGURATION_KEYS):
             batch[key] = str(ind)
 
         self.client.post('/conf/batch_create/', batch)
 
-        for ind, key in enumerate(keys):
+        for ind, key in enumerate(CONFIGURATION_KEYS):
             self.assertEqual(Configuration.objects.filter(key=key).count(), 1)
             conf = Configuration.objects.filter(key=key).first()
             self.assertEqual(conf.value, str(ind))
@@ -1108,12 +1085,10 @@ class ConfigurationAPITest(TestCase):
         the new configuration object be updated in database with a new value as below.
         :return:
         """
-        # retrieve all possible keys for KEY_CHOICES
-        keys = [key for (key, temp) in CONFIGURATION_KEY_CHOICE]
+        # create configuration objects to check the functionality of 'post' method
+        Configuration.objects.bulk_create([Configuration(key=key, value='1') for key in CONFIGURATION_KEYS])
         # send http 'post' request to the configuration endpoint and validate the result
-        for key in keys:
-            # create a configuration object to check the functionality of 'post' method
-            Configuration.objects.create(key=key, value='1')
+        for key in CONFIGURATION_KEYS:
             # send http 'post' request to the endpoint
             response = self.client.post('/conf/', {'key': key, 'value': '2'})
             # check the status of the response
@@ -1126,12 +1101,10 @@ class ConfigurationAPITest(TestCase):
             self.assertEqual(configurations.first().value, '2')
 
     def test_value_type_conversion(self):
-        keys = [key for (key, temp) in CONFIGURATION_KEY_CHOICE]
-        for i, key in enumerate(keys):
-            Configuration.objects.create(key=key, value='1')
+        Configuration.objects.bulk_create([Configuration(key=key, value='1') for key in CONFIGURATION_KEYS])
 
         # checking validity of conversion
-        for i, key in enumerate(keys):
+        for i, key in enumerate(CONFIGURATION_KEYS):
             val = Configuration.objects.__getattr__(key)
             val_type = CONFIGURATION_KEY_TO_TYPE[key]
 
@@ -1142,9 +1115,10 @@ class ConfigurationAPITest(TestCase):
         check manager model of configuration to get expected value when exists
         :return:
         """
-        for key, label in CONFIGURATION_KEY_CHOICE:
-            Configuration.objects.create(key=key, value='100000')
-        for key, label in CONFIGURATION_KEY_CHOICE:
+        Configuration.objects.bulk_create([
+            Configuration(key=key, value='100000') for key in CONFIGURATION_KEYS
+        ])
+        for key in CONFIGURATION_KEYS:
             val_type = CONFIGURATION_KEY_TO_TYPE[key]
             self.assertEqual(getattr(Configuration.objects, key), locate(val_type)('100000'))
 
@@ -1154,7 +1128,7 @@ class ConfigurationAPITest(TestCase):
         :return:
         """
         Configuration.objects.all().delete()
-        for key, label in CONFIGURATION_KEY_CHOICE:
+        for key in CONFIGURATION_KEYS:
             self.assertEqual(getattr(Configuration.objects, key), CONFIGURATION_DEFAULT_KEY_VALUE.get(key))
 
     def test_invalid_configuration_format(self):
@@ -1166,13 +1140,23 @@ class ConfigurationAPITest(TestCase):
         Configuration.objects.create(key="TOTAL_REWARD", value='teststr')
         self.assertEqual(Configuration.objects.TOTAL_REWARD, CONFIGURATION_DEFAULT_KEY_VALUE["TOTAL_REWARD"])
 
-    def tearDown(self):
+    def test_snapshot(self):
         """
-        tearDown function to delete all configuration objects
+        snapshot of configurations must contain same values as manager attributes with only one query
+        stored, not stored and invalid values are checked, keys which are not given must not be converted
         :return:
         """
-        # delete all configuration objects
-        Configuration.objects.all().delete()
+        Configuration.objects.create(key="TOTAL_REWARD", value='teststr')
+        Configuration.objects.create(key="FEE_FACTOR", value='0.1')
+        with self.assertNumQueries(1):
+            configurations = Configuration.objects.snapshot(*CONFIGURATION_KEYS)
+        for key in CONFIGURATION_KEYS:
+            self.assertEqual(configurations[key], getattr(Configuration.objects, key))
+        self.assertEqual(configurations['FEE_FACTOR'], 0.1)
+        with patch('core.models.logger.error') as mocked_error:
+            configurations = Configuration.objects.snapshot('FEE_FACTOR')
+        self.assertDictEqual(dict(configurations), {'FEE_FACTOR': 0.1})
+        mocked_error.assert_not_called()
 
 
 class PPLNSFunctionTest(TestCase):
@@ -1183,40 +1167,48 @@ class PPLNSFunctionTest(TestCase):
     So in other situations the results may not be valid.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
-        setUp function to create 3 miners and 36 test
+        create configurations, 3 miners and 46 shares once for all tests
         :return:
         """
-        Configuration.objects.create(key='REWARD_ALGORITHM', value='PPLNS')
-        Configuration.objects.create(key='TOTAL_REWARD', value=str(int(67.5e9)))
-        Configuration.objects.create(key='FEE_FACTOR', value='0')
-        Configuration.objects.create(key='REWARD_FACTOR', value=str(65 / 67.5))
-        self.PPLNS = RewardAlgorithm.get_instance().perform_logic
+        Configuration.objects.bulk_create([
+            Configuration(key='REWARD_ALGORITHM', value='PPLNS'),
+            Configuration(key='TOTAL_REWARD', value=str(int(67.5e9))),
+            Configuration(key='FEE_FACTOR', value='0'),
+            Configuration(key='REWARD_FACTOR', value=str(65 / 67.5)),
+            # set pplns prev count to 10
+            Configuration(key='PPLNS_N', value='10')
+        ])
+        cls.algorithm = RewardAlgorithm.get_instance()
+        cls.reward = cls.algorithm.get_reward_to_share()
         # create miners lists
-        miners = [Miner.objects.create(public_key=str(i)) for i in range(3)]
+        miners = Miner.objects.bulk_create([Miner(public_key=str(i)) for i in range(3)])
         # create shares list
-        shares = [Share.objects.create(
+        shares = Share.objects.bulk_create([Share(
             share=str(i),
             miner=miners[int(i / 2) % 3],
             status="solved" if i in [14, 44, 45] else "valid" if i % 2 == 0 else "invalid",
             block_height=10,
             difficulty=1000
-        ) for i in range(46)]
-        # set create date for each shares to make them a sequence valid
+        ) for i in range(46)])
+        # set create date for each shares to make them a sequence valid,
+        # auto_now_add overrides created_at on insert so it is updated afterwards
         start_date = timezone.now() + timedelta(seconds=-100)
-        for share in shares:
-            share.created_at = start_date
-            share.save()
-            start_date += timedelta(seconds=1)
-        # set pplns prev count to 10
-        Configuration.objects.create(key="PPLNS_N", value='10')
-        self.miners = miners
-        self.shares = shares
+        for i, share in enumerate(shares):
+            share.created_at = start_date + timedelta(seconds=i)
+        Share.objects.bulk_update(shares, ['created_at'])
+        cls.miners = miners
+        cls.shares = shares
+        cls.public_keys = {miner.pk: miner.public_key for miner in miners}
+
+    def setUp(self):
+        self.PPLNS = self.algorithm.perform_logic
 
     def get_share_balance(self, sh):
-        return dict(Balance.objects.filter(share=sh, status='immature').values_list('miner__public_key').annotate(
-            Sum('balance')))
+        balances = Balance.objects.filter(share=sh, status='immature').values_list('miner_id').annotate(Sum('balance'))
+        return {self.public_keys[miner_id]: balance for miner_id, balance in balances}
 
     def test_pplns_with_invalid_share(self):
         """
@@ -1243,11 +1235,9 @@ class PPLNSFunctionTest(TestCase):
         block_height of miner 1 share is 100, so balances created for this miner must match
         """
         share = self.shares[14]
-        for s in self.shares[:14]:
-            if s.status == 'valid' and s.miner.public_key == '0':
-                s.block_height = 100
-                s.save()
-                break
+        # shares are shared between tests, so the change is only made in database
+        s = next(s for s in self.shares[:14] if s.status == 'valid' and s.miner.public_key == '0')
+        Share.objects.filter(pk=s.pk).update(block_height=100)
         self.PPLNS(share)
         balances = self.get_share_balance(share)
         self.assertEqual(balances, {'0': int(24.375e9), '1': int(24.375e9), '2': int(16.25e9)})
@@ -1282,24 +1272,22 @@ class PPLNSFunctionTest(TestCase):
         so in second call balances must be changed
         :return:
         """
-        Configuration.objects.create(key='MAX_REWARD', value=int(65e9))
+        set_configuration('MAX_REWARD', int(65e9))
         share = self.shares[44]
         self.PPLNS(share)
         balances = self.get_share_balance(share)
         self.assertEqual(balances, {'0': int(19.5e9), '1': int(26.0e9), '2': int(19.5e9)})
 
-        cur = Share.objects.create(miner=Miner.objects.get(public_key='1'), status='valid', difficulty=10000)
+        cur = Share.objects.create(miner=self.miners[1], status='valid', difficulty=10000)
         cur.created_at = share.created_at - timedelta(seconds=1)
         cur.save()
-        Configuration.objects.filter(key="PPLNS_N").update(value='11')
+        set_configuration('PPLNS_N', 11)
         self.PPLNS(share)
         cur_balances = self.get_share_balance(share)
         self.assertEqual(cur_balances, {'0': int(9.75e9), '1': int(45.5e9), '2': int(9.75e9)})
+        balance_counts = get_balance_counts(status='immature', share=share)
         for miner_id in cur_balances:
-            balance = Balance.objects.filter(miner__public_key=miner_id,
-                                             balance=cur_balances[miner_id] - balances[miner_id],
-                                             status='immature', share=share)
-            self.assertEqual(balance.count(), 1)
+            self.assertEqual(balance_counts.get((miner_id, cur_balances[miner_id] - balances[miner_id])), 1)
 
     def test_pplns_with_lower_amount_of_shares_with_fee(self):
         """
@@ -1307,8 +1295,7 @@ class PPLNSFunctionTest(TestCase):
         :return:
         """
         share = self.shares[14]
-        reward = RewardAlgorithm.get_instance().get_reward_to_share()
-        Configuration.objects.create(key='FEE_FACTOR', value=str(10e9 / reward))
+        set_configuration('FEE_FACTOR', 10e9 / self.reward)
         self.PPLNS(share)
         balances = self.get_share_balance(share)
         self.assertEqual(balances, {'0': int(20.625e9), '1': int(20.625e9), '2': int(13.75e9)})
@@ -1320,8 +1307,7 @@ class PPLNSFunctionTest(TestCase):
         :return:
         """
         share = self.shares[44]
-        reward = RewardAlgorithm.get_instance().get_reward_to_share()
-        Configuration.objects.create(key='FEE_FACTOR', value=str(10e9 / reward))
+        set_configuration('FEE_FACTOR', 10e9 / self.reward)
         self.PPLNS(share)
         balances = self.get_share_balance(share)
         self.assertEqual(balances, {'0': int(16.5e9), '1': int(22.0e9), '2': int(16.5e9)})
@@ -1332,8 +1318,7 @@ class PPLNSFunctionTest(TestCase):
         :return:
         """
         share = self.shares[44]
-        reward = RewardAlgorithm.get_instance().get_reward_to_share()
-        Configuration.objects.create(key='FEE_FACTOR', value=str(10e9 / reward))
+        set_configuration('FEE_FACTOR', 10e9 / self.reward)
         for i in range(5):
             self.PPLNS(share)
             balances = self.get_share_balance(share)
@@ -1345,35 +1330,20 @@ class PPLNSFunctionTest(TestCase):
         :return:
         """
         share = self.shares[14]
-        miner = Miner.objects.get(public_key='2')
+        miner = self.miners[2]
         Share.objects.filter(miner=miner).delete()
         others_difficulty = Share.objects.filter(created_at__lte=share.created_at, miner__public_key__in=['0', '1'],
                                                  status__in=['solved', 'valid']) \
-            .aggregate(Sum('difficulty'))
-        others_difficulty = others_difficulty['difficulty__sum']
-        cur = Share.objects.create(miner=miner, status='valid', difficulty=others_difficulty)
-        cur.created_at = share.created_at - timedelta(seconds=1)
-        cur.save()
+            .aggregate(Sum('difficulty'))['difficulty__sum']
+        # auto_now_add ignores a given created_at, so the share is inserted with its date at once
+        with patch('django.utils.timezone.now', return_value=share.created_at - timedelta(seconds=1)):
+            Share.objects.create(miner=miner, status='valid', difficulty=others_difficulty)
 
         self.PPLNS(share)
         balances = self.get_share_balance(share)
         val = 65. / 4
         self.assertEqual(balances, {'0': int(val * 1e9), '1': int(val * 1e9), '2': int(val * 2e9)})
 
-    def tearDown(self):
-        """
-        tearDown function to delete miners created in setUp function
-        :return:
-        """
-        # delete all Balance objects
-        Balance.objects.all().delete()
-        # delete all Share objects
-        Share.objects.all().delete()
-        # delete all Miner objects
-        Miner.objects.all().delete()
-        # delete all configurations
-        Configuration.objects.all().delete()
-
 
 class PPSFunctionTest(TestCase):
     """
@@ -1395,20 +1365,20 @@ class PPSFunctionTest(TestCase):
         Configuration.objects.create(key='REWARD_FACTOR', value=str(65 / 67.5))
         Configuration.objects.create(key='POOL_BASE_FACTOR', value=str(1000))
         # create miners lists
-        miners = [Miner.objects.create(nick_name="miner %d" % i, public_key=str(i)) for i in range(3)]
+        miners = Miner.objects.bulk_create([Miner(nick_name="miner %d" % i, public_key=str(i)) for i in range(3)])
         # create shares list
-        shares = [Share.objects.create(
+        shares = Share.objects.bulk_create([Share(
             share=str(i),
             miner=miners[i % 3],
             status="solved" if i in [14, 34, 35] else "valid" if i % 2 == 0 else "invalid",
             difficulty=1000
-        ) for i in range(36)]
-        # set create date for each shares to make them a sequence valid
+        ) for i in range(36)])
+        # set create date for each shares to make them a sequence valid,
+        # auto_now_add overrides created_at on insert so it is updated afterwards
         start_date = timezone.now() + timedelta(seconds=-100)
-        for share in shares:
-            share.created_at = start_date
-            share.save()
-            start_date += timedelta(seconds=1)
+        for i, share in enumerate(shares):
+            share.created_at = start_date + timedelta(seconds=i)
+        Share.objects.bulk_update(shares, ['created_at'])
         self.miners = miners
         self.shares = shares
         self.pps = RewardAlgorithm.get_instance().perform_logic
@@ -1450,17 +1420,23 @@ class PPSFunctionTest(TestCase):
         balances = Balance.objects.filter(share=share).count()
         self.assertEqual(balances, 0)
 
-    def tearDown(self):
-        """
-        tearDown function to delete miners created in setUp function
-        :return:
-        """
-        Configuration.objects.all().delete()
-        Balance.objects.all().delete()
-        Share.objects.all().delete()
-        Miner.objects.all().delete()
 
+def mocked_get_blocks_request(urls, params=None, **kwargs):
+    """
+    mock requests with method get for urls 'blocks'
+    """
+
+    class MockResponse:
+        def __init__(self, json_data):
+            self.json_data = json_data
+
+        def json(self):
+            return self.json_data
 
+    return MockResponse(load_test_data("test_get_blocks.json"))
+
+
+@patch("requests.get", side_effect=mocked_get_blocks_request)
 class BlockTestCase(TestCase):
     """
     Test for different modes call api /blocks
@@ -1468,22 +1444,6 @@ class BlockTestCase(TestCase):
      if mined there was flag "inpool": True
     """
 
-    def mocked_get_request(urls, params=None, **kwargs):
-        """
-        mock requests with method get for urls 'blocks'
-        """
-
-        class MockResponse:
-            def __init__(self, json_data):
-                self.json_data = json_data
-
-            def json(self):
-                return self.json_data
-
-        with open("core/data_testing/test_get_blocks.json", "r") as read_file:
-            response = json.load(read_file)
-        return MockResponse(response)
-
     def setUp(self):
         """
         Create a miner and after that create 3 objects => solved = 2 and valid = 1
@@ -1509,7 +1469,6 @@ class BlockTestCase(TestCase):
             share.save()
             i = i + 1
 
-    @patch("requests.get", side_effect=mocked_get_request)
     def test_get_offset_limit(self, mocked):
         """
         Send a http 'get' request for get blocks with => page = 1 and size = 4 in this test, we must get 4 blocks and
@@ -1536,7 +1495,6 @@ class BlockTestCase(TestCase):
         self.assertEqual(heights_result, heights)
         self.assertEqual(blocks_pool_result, blocks_pool)
 
-    @patch("requests.get", side_effect=mocked_get_request)
     def test_pass_extra_queries(self, mocked):
         """
         call function with extra get arguments must cause pass arguments as get to api
@@ -1552,23 +1510,12 @@ class BlockTestCase(TestCase):
         query = mocked.call_args[0][1] or {}
         if parsed_url.query:
             query.update(parsed_url.query)
-        # query must contain only two keys
-        self.assertEqual(sorted(list(query.keys())), ["limit", "offset", "sortBy", "sortDirection"])
+        # query must contain only these keys
+        self.assertEqual(set(query), {"limit", "offset", "sortBy", "sortDirection"})
         # sortBy parameter must contains only "height"
-        sort_by = query.get("sortBy", [])
-        if isinstance(sort_by, str):
-            sort_by = [sort_by]
-        self.assertEqual(sort_by, ["height"])
+        self.assertIn(query.get("sortBy"), ("height", ["height"]))
         # sortDirection parameter must contains only "asc"
-        sort_by = query.get("sortDirection", [])
-        if isinstance(sort_by, str):
-            sort_by = [sort_by]
-        self.assertEqual(sort_by, ["asc"])
-
-    def tearDown(self) -> None:
-        Configuration.objects.all().delete()
-        Miner.objects.all().delete()
-        Share.objects.all().delete()
+        self.assertIn(query.get("sortDirection"), ("asc", ["asc"]))
 
 
 def mocked_node_request_transaction_generate_test(*args, **kwargs):
@@ -1577,15 +1524,9 @@ def mocked_node_request_transaction_generate_test(*args, **kwargs):
     """
     url = args[0]
 
-    if url == 'wallet/boxes/unspent':
-        with open("core/data_testing/test_boxes.json", "r") as read_file:
-            return {
-                'response': json.load(read_file),
-                'status': 'success'
-            }
-
-    if 'utxo/byIdBinary/' in url:
-        last_part = url.split('/')[-1]
+    # called once for each used box, so it is checked first
+    if url.startswith('utxo/byIdBinary/'):
+        last_part = url.rpartition('/')[2]
         return {
             'response': {
                 'boxId': last_part,
@@ -1594,13 +1535,19 @@ def mocked_node_request_transaction_generate_test(*args, **kwargs):
             'status': 'success'
         }
 
+    if url == 'wallet/boxes/unspent':
+        return {
+            'response': read_test_data("test_boxes.json"),
+            'status': 'success'
+        }
+
     if url == 'transactions':
         return {
             'status': 'success'
         }
 
     if url == 'wallet/transaction/generate':
-        tx = json.loads(open("core/data_testing/sample_tx.json", "r").read())
+        tx = load_test_data("sample_tx.json")
         req = kwargs['data']
         tx['inputs'] = [{'boxId': x} for x in req['inputsRaw']]
         tx['id'] = ''.join(req['inputsRaw'])
@@ -1623,93 +1570,78 @@ class TransactionGenerateTestCase(TestCase):
     Balance statuses: 2: mature, 3: withdraw, 4: pending_withdrawal
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         creates necessary configuration and objects and a default output list
-        also created balances must have default heights
         """
         # setting configuration
         Configuration.objects.create(key='MAX_NUMBER_OF_OUTPUTS', value='4')
 
         # creating 10 miners
-        pks = [random_string() for i in range(10)]
-        for pk in pks:
-            Miner.objects.create(public_key=pk)
+        pks = MINER_PUBLIC_KEYS
+        cls.miners = Miner.objects.bulk_create([Miner(public_key=pk) for pk in pks])
 
         # create output for each miner
-        self.outputs = [(pk, int((i + 1) * 1e10)) for i, pk in enumerate(pks)]
+        cls.outputs = [(pk, int((i + 1) * 1e10)) for i, pk in enumerate(pks)]
+        Address.objects.bulk_create([
+            Address(address_miner=miner, category='miner', address=miner.public_key) for miner in cls.miners
+        ])
+
+    def setUp(self):
+        """
+        created balances must have default heights, they are inserted by tests so they are made for each test
+        """
         self.pending_balances = [
-            Balance(miner=Miner.objects.get(public_key=x[0]), balance=-x[1], actual_payment=x[1],
+            Balance(miner=miner, balance=-x[1], actual_payment=x[1],
                     status="pending_withdrawal",
-                    min_height=1, max_height=100) for x in
-            self.outputs]
-        for pk, _ in self.outputs:
-            Address.objects.create(address_miner=Miner.objects.get(public_key=pk), category='miner', address=pk)
+                    min_height=1, max_height=100) for miner, x in
+            zip(self.miners, self.outputs)]
+
+    def check_transactions(self, expected):
+        """
+        checks inputs and number of balances of each created transaction in order, with one query
+        :param expected: list of (inputs, number of balances) for each transaction
+        """
+        transactions = Transaction.objects.order_by('pk').values_list('inputs').annotate(Count('balance'))
+        self.assertEqual(list(transactions), [(','.join(inputs), count) for inputs, count in expected])
 
     def test_generate_three_transactions_max_num_output_4(self, mocked_request):
         """
         calling the function with all outputs and MAX_NUMBER_OF_OUTPUT = 4
         must create 3 transactions and required balances
         """
-        for i, _ in enumerate(self.pending_balances):
-            self.pending_balances[i].save()
+        Balance.objects.bulk_create(self.pending_balances)
 
         self.assertEqual(Transaction.objects.count(), 0)
         handle_withdraw()
 
-        req = [(['a', 'b', 'c', 'd'], 4), (['e', 'f', 'g'], 4), (['h', 'i'], 2)]
-        self.assertEqual(Transaction.objects.count(), len(req))
-        for i, tx in enumerate(Transaction.objects.all()):
-            self.assertEqual(tx.inputs, ','.join(req[i][0]))
-            self.assertEqual(Balance.objects.filter(tx=tx).count(), req[i][1])
+        self.check_transactions([(['a', 'b', 'c', 'd'], 4), (['e', 'f', 'g'], 4), (['h', 'i'], 2)])
 
     def test_generate_one_transactions_max_num_output_4(self, mocked_request):
         """
         calling the function with 4 outputs and MAX_NUMBER_OF_OUTPUT = 4
         must create 1 transactions and required balances
         """
-        pending = self.pending_balances[0:4]
-        for i, _ in enumerate(pending):
-            self.pending_balances[i].save()
+        Balance.objects.bulk_create(self.pending_balances[0:4])
 
         self.assertEqual(Transaction.objects.count(), 0)
         handle_withdraw()
 
-        req = [(['a', 'b', 'c', 'd'], 4)]
-        self.assertEqual(Transaction.objects.count(), len(req))
-        for i, tx in enumerate(Transaction.objects.all()):
-            self.assertEqual(tx.inputs, ','.join(req[i][0]))
-            self.assertEqual(Balance.objects.filter(tx=tx).count(), req[i][1])
+        self.check_transactions([(['a', 'b', 'c', 'd'], 4)])
 
     def test_generate_three_transactions_max_num_output_20(self, mocked_request):
         """
         calling the function with all outputs and MAX_NUMBER_OF_OUTPUT = 20
         must create 1 transactions and required balances
         """
-        pending = self.pending_balances
-        for i, _ in enumerate(pending):
-            self.pending_balances[i].save()
+        Balance.objects.bulk_create(self.pending_balances)
 
         self.assertEqual(Transaction.objects.count(), 0)
         Configuration.objects.create(key='MAX_NUMBER_OF_OUTPUTS', value='20')
         handle_withdraw()
 
-        req = [([a for a in 'abcdefghi'], 10)]
-        self.assertEqual(Transaction.objects.count(), len(req))
-        for i, tx in enumerate(Transaction.objects.all()):
-            self.assertEqual(tx.inputs, ','.join(req[i][0]))
-            self.assertEqual(Balance.objects.filter(tx=tx).count(), req[i][1])
-
-    def tearDown(self):
-        """
-        tearDown function to clean up objects created in setUp function
-        :return:
-        """
-        Configuration.objects.all().delete()
-        Miner.objects.all().delete()
-        Share.objects.all().delete()
-        Balance.objects.all().delete()
-        # delete all miners objects. all related objects are deleted
+        self.check_transactions([(list('abcdefghi'), 10)])
 
 
 class PeriodicWithdrawalTestCase(TestCase):
@@ -1718,7 +1650,8 @@ class PeriodicWithdrawalTestCase(TestCase):
     Balance statuses: mature, withdraw, pending_withdrawal
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         creates necessary configuration and objects and a default output list
         :return:
@@ -1727,18 +1660,29 @@ class PeriodicWithdrawalTestCase(TestCase):
         Configuration.objects.create(key='DEFAULT_WITHDRAW_THRESHOLD', value=str(int(100e9)))
 
         # creating 10 miners
-        pks = [random_string() for i in range(10)]
-        for pk in pks:
-            Miner.objects.create(public_key=pk)
-
-        self.miners = Miner.objects.all()
+        pks = MINER_PUBLIC_KEYS
+        miners = Miner.objects.bulk_create([Miner(public_key=pk) for pk in pks])
 
         # by default all miners have balance of 80 erg
-        for miner in Miner.objects.all():
-            Balance.objects.create(miner=miner, balance=int(100e9), status="mature", min_height=1, max_height=10)
-            Balance.objects.create(miner=miner, balance=int(-20e9), status="withdraw", min_height=1, max_height=10)
+        balances = []
+        for miner in miners:
+            balances += [Balance(miner=miner, balance=int(100e9), status="mature", min_height=1, max_height=10),
+                         Balance(miner=miner, balance=int(-20e9), status="withdraw", min_height=1, max_height=10)]
+        Balance.objects.bulk_create(balances)
+
+    def setUp(self):
+        """
+        tests change thresholds of miners, so miners are read again for each test
+        :return:
+        """
+        self.miners = list(Miner.objects.order_by('pk'))
 
-        self.outputs = [(pk, int(80e9)) for pk in pks]
+    def get_pending_withdrawals(self):
+        """
+        public key, balance and heights of all pending withdrawal balances, sorted, with one query
+        """
+        return sorted(Balance.objects.filter(status="pending_withdrawal").values_list(
+            'miner__public_key', 'balance', 'min_height', 'max_height'))
 
     def test_all_miners_below_defualt_threshold(self):
         """
@@ -1752,7 +1696,6 @@ class PeriodicWithdrawalTestCase(TestCase):
         all miners balances are below default threshold but one
         """
         Balance.objects.create(miner=self.miners[0], balance=int(100e9), status="mature")
-        max_id = Balance.objects.all().aggregate(Max('pk'))['pk__max']
         periodic_withdrawal()
 
         self.assertEqual(
@@ -1766,12 +1709,9 @@ class PeriodicWithdrawalTestCase(TestCase):
         miner = self.miners[0]
         miner.periodic_withdrawal_amount = int(20e9)
         miner.save()
-        max_id = Balance.objects.all().aggregate(Max('pk'))['pk__max']
         periodic_withdrawal()
 
-        self.assertEqual(Balance.objects.filter(miner=miner, balance=int(-80e9),
-                                                status="pending_withdrawal").count(), 1)
-        self.assertEqual(Balance.objects.filter(status="pending_withdrawal").count(), 1)
+        self.assertEqual(get_balance_counts(status="pending_withdrawal"), {(miner.public_key, int(-80e9)): 1})
 
     def test_all_miner_below_default_threshold_two_explicit_threshold(self):
         """
@@ -1784,14 +1724,9 @@ class PeriodicWithdrawalTestCase(TestCase):
         miner2 = self.miners[1]
         miner2.periodic_withdrawal_amount = int(80e9)
         miner2.save()
-        max_id = Balance.objects.all().aggregate(Max('pk'))['pk__max']
         periodic_withdrawal()
-        pks = sorted([m.public_key for m in [miner1, miner2]])
-        outputs = [(pk, int(80e9), max_id + 1 + i) for i, pk in enumerate(pks)]
-        for miner in [miner1, miner2]:
-            self.assertEqual(
-                Balance.objects.filter(miner=miner, balance=int(-80e9), status="pending_withdrawal").count(), 1)
-        self.assertEqual(Balance.objects.filter(status="pending_withdrawal").count(), 2)
+        self.assertEqual(get_balance_counts(status="pending_withdrawal"),
+                         {(miner.public_key, int(-80e9)): 1 for miner in [miner1, miner2]})
 
     def test_all_miners_but_one_below_default_threshold_two_explicit_threshold_one_not_above(self):
         """
@@ -1804,12 +1739,9 @@ class PeriodicWithdrawalTestCase(TestCase):
         miner2 = self.miners[1]
         miner2.periodic_withdrawal_amount = int(90e9)
         miner2.save()
-        max_id = Balance.objects.all().aggregate(Max('pk'))['pk__max']
         periodic_withdrawal()
 
-        self.assertEqual(Balance.objects.filter(miner=miner1, balance=int(-80e9), status="pending_withdrawal").count(),
-                         1)
-        self.assertEqual(Balance.objects.filter(status="pending_withdrawal").count(), 1)
+        self.assertEqual(get_balance_counts(status="pending_withdrawal"), {(miner1.public_key, int(-80e9)): 1})
 
     def test_all_miners_but_one_below_default_one_above_default_below_explicit(self):
         """
@@ -1828,68 +1760,46 @@ class PeriodicWithdrawalTestCase(TestCase):
         """
         all miners balances are above default threshold but one
         """
-        for miner in self.miners:
-            Balance.objects.create(miner=miner, balance=int(30e9), status="mature")
         miner1 = self.miners[0]
-        Balance.objects.create(miner=miner1, balance=int(-80e9), status="mature")
-        max_id = Balance.objects.all().aggregate(Max('pk'))['pk__max']
-        pks = sorted([m.public_key for m in self.miners[1:]])
-        outputs = [(pk, int(110e9), max_id + 1 + i) for i, pk in enumerate(pks)]
+        balances = [Balance(miner=miner, balance=int(30e9), status="mature") for miner in self.miners]
+        balances.append(Balance(miner=miner1, balance=int(-80e9), status="mature"))
+        Balance.objects.bulk_create(balances)
         periodic_withdrawal()
 
-        for miner in self.miners[1:]:
-            self.assertEqual(
-                Balance.objects.filter(miner=miner, balance=int(-110e9), status="pending_withdrawal",
-                                       min_height=1, max_height=10).count(), 1)
-        self.assertEqual(Balance.objects.filter(status="pending_withdrawal").count(), len(self.miners) - 1)
+        self.assertEqual(self.get_pending_withdrawals(),
+                         sorted((miner.public_key, int(-110e9), 1, 10) for miner in self.miners[1:]))
 
     def test_all_miners_above_default_diff_height(self):
         """
         all miners balances are above default threshold, pending_withdrawal balances must have valid height
         """
-        for i, miner in enumerate(self.miners[:5]):
-            Balance.objects.create(miner=miner, balance=int(30e9), status="mature", max_height=10 + i)
-
-        for i, miner in enumerate(self.miners[5:]):
-            Balance.objects.create(miner=miner, balance=int(30e9), status="mature", min_height=0, max_height=10 + i)
+        balances = [Balance(miner=miner, balance=int(30e9), status="mature", max_height=10 + i)
+                    for i, miner in enumerate(self.miners[:5])]
+        balances += [Balance(miner=miner, balance=int(30e9), status="mature", min_height=0, max_height=10 + i)
+                     for i, miner in enumerate(self.miners[5:])]
         miner1 = self.miners[0]
-        Balance.objects.create(miner=miner1, balance=int(-80e9), status="mature")
-        max_id = Balance.objects.all().aggregate(Max('pk'))['pk__max']
-        pks = sorted([m.public_key for m in self.miners[1:]])
-        outputs = [(pk, int(110e9), max_id + 1 + i) for i, pk in enumerate(pks)]
+        balances.append(Balance(miner=miner1, balance=int(-80e9), status="mature"))
+        Balance.objects.bulk_create(balances)
         periodic_withdrawal()
 
-        for i, miner in enumerate(self.miners[1:5]):
-            self.assertEqual(
-                Balance.objects.filter(miner=miner, balance=int(-110e9), status="pending_withdrawal",
-                                       min_height=1, max_height=11 + i).count(), 1)
-
-        for i, miner in enumerate(self.miners[5:]):
-            self.assertEqual(
-                Balance.objects.filter(miner=miner, balance=int(-110e9), status="pending_withdrawal",
-                                       min_height=0, max_height=10 + i).count(), 1)
-
-        self.assertEqual(Balance.objects.filter(status="pending_withdrawal").count(), len(self.miners) - 1)
+        expected = [(miner.public_key, int(-110e9), 1, 11 + i) for i, miner in enumerate(self.miners[1:5])]
+        expected += [(miner.public_key, int(-110e9), 0, 10 + i) for i, miner in enumerate(self.miners[5:])]
+        self.assertEqual(self.get_pending_withdrawals(), sorted(expected))
 
     def test_all_miners_above_default_but_one_no_balance(self):
         """
         all miners balances are above default threshold but one
         one doesn't have any balance
         """
-        for miner in self.miners:
-            Balance.objects.create(miner=miner, balance=int(30e9), status="mature")
         miner1 = self.miners[0]
+        Balance.objects.bulk_create([Balance(miner=miner, balance=int(30e9), status="mature")
+                                     for miner in self.miners[1:]])
+        # remove balances of fixtures
         Balance.objects.filter(miner=miner1).delete()
-        max_id = Balance.objects.all().aggregate(Max('pk'))['pk__max']
-        pks = sorted([m.public_key for m in self.miners[1:]])
-        outputs = [(pk, int(110e9), max_id + 1 + i) for i, pk in enumerate(pks)]
-        outputs = sorted(outputs)
         periodic_withdrawal()
 
-        for miner in self.miners[1:]:
-            self.assertEqual(
-                Balance.objects.filter(miner=miner, balance=int(-110e9), status="pending_withdrawal").count(), 1)
-        self.assertEqual(Balance.objects.filter(status="pending_withdrawal").count(), len(self.miners) - 1)
+        self.assertEqual(get_balance_counts(status="pending_withdrawal"),
+                         {(miner.public_key, int(-110e9)): 1 for miner in self.miners[1:]})
 
     def test_no_balance(self):
         """
@@ -1899,17 +1809,6 @@ class PeriodicWithdrawalTestCase(TestCase):
         periodic_withdrawal()
         self.assertEqual(Balance.objects.filter(status="pending_withdrawal").count(), 0)
 
-    def tearDown(self):
-        """
-        tearDown function to clean up objects created in setUp function
-        :return:
-        """
-        Configuration.objects.all().delete()
-        Miner.objects.all().delete()
-        Share.objects.all().delete()
-        Balance.objects.all().delete()
-        # delete all miners objects. all related objects are deleted
-
 
 class ImmatureToMatureTestCase(TestCase):
     """
@@ -1922,12 +1821,11 @@ class ImmatureToMatureTestCase(TestCase):
 
     def mocked_reward_algorithm(*args, **kwargs):
         share = args[0]
-        miners = Miner.objects.all()
-        for miner in miners[:5]:
-            Balance.objects.create(miner=miner, share=share, status='immature', balance=-10)
-
-        for miner in miners[5:]:
-            Balance.objects.create(miner=miner, share=share, status='immature', balance=10)
+        miners = ImmatureToMatureTestCase.miners
+        Balance.objects.bulk_create(
+            [Balance(miner=miner, share=share, status='immature', balance=-10) for miner in miners[:5]] +
+            [Balance(miner=miner, share=share, status='immature', balance=10) for miner in miners[5:]]
+        )
 
     def mocked_node_request(*args, **kwargs):
         """
@@ -1954,14 +1852,14 @@ class ImmatureToMatureTestCase(TestCase):
             }
 
         if 'chainslice' in url.lower():
-            headers = json.loads(open('core/data_testing/headers.json').read())
+            headers = read_test_data("headers.json")
             return {
                 'status': 'success',
                 'response': headers
             }
 
         if 'blocks' in url.lower():
-            headers = json.loads(open('core/data_testing/sibling_header.json').read())
+            headers = read_test_data("sibling_header.json")
             return {
                 'status': 'success',
                 'response': {
@@ -1974,7 +1872,8 @@ class ImmatureToMatureTestCase(TestCase):
             'status': 'error'
         }
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         creates necessary configuration and objects and a default output list
         20 confirmed shares
@@ -1984,59 +1883,58 @@ class ImmatureToMatureTestCase(TestCase):
         for each miner and share: 3 balance with different statuses
         :return:
         """
-        self.client = Client()
-        self.CURRENT_HEIGHT = ImmatureToMatureTestCase.CURRENT_HEIGHT
-
         # setting configuration
         Configuration.objects.create(key='CONFIRMATION_LENGTH', value='720')
 
         # creating 10 miners
-        pks = [random_string() for i in range(10)]
-        for pk in pks:
-            Miner.objects.create(public_key=pk)
-
-        self.miners = Miner.objects.all()
-        CONFIRMATION_LENGTH = Configuration.objects.CONFIRMATION_LENGTH
+        pks = MINER_PUBLIC_KEYS
+        cls.miners = Miner.objects.bulk_create([Miner(public_key=pk) for pk in pks])
+        cls.CONFIRMATION_LENGTH = Configuration.objects.CONFIRMATION_LENGTH
         default_hash = '0fd923ca5e7218c4ba3c3801c26a617ecdbfdaebb9c76ce2eca166e7855efbb8'
+        shares = []
         for i in range(5):
             # not important shares
-            num_confirmation = CONFIRMATION_LENGTH + 10
-            block_height = self.CURRENT_HEIGHT - num_confirmation
+            num_confirmation = cls.CONFIRMATION_LENGTH + 10
+            block_height = cls.CURRENT_HEIGHT - num_confirmation
             tx_id = '_'.join([random_string(), str(block_height), str(num_confirmation)])
-            Share.objects.create(miner=self.miners[0], transaction_id=tx_id, difficulty=1,
-                                 block_height=block_height, status='valid', parent_id='1',
-                                 pow_identity=default_hash)
+            shares.append(Share(miner=cls.miners[0], transaction_id=tx_id, difficulty=1,
+                                block_height=block_height, status='valid', parent_id='1',
+                                pow_identity=default_hash))
 
             # confirmed shares
-            num_confirmation = CONFIRMATION_LENGTH + 10
-            block_height = self.CURRENT_HEIGHT - num_confirmation
+            num_confirmation = cls.CONFIRMATION_LENGTH + 10
+            block_height = cls.CURRENT_HEIGHT - num_confirmation
             tx_id = '_'.join([random_string(), str(block_height), str(num_confirmation)])
-            Share.objects.create(miner=self.miners[0], transaction_id=tx_id, difficulty=1,
-                                 block_height=block_height, status='solved', parent_id='1',
-                                 pow_identity=default_hash)
+            shares.append(Share(miner=cls.miners[0], transaction_id=tx_id, difficulty=1,
+                                block_height=block_height, status='solved', parent_id='1',
+                                pow_identity=default_hash))
 
             # confirmed just now
-            num_confirmation = CONFIRMATION_LENGTH
-            block_height = self.CURRENT_HEIGHT - num_confirmation
+            num_confirmation = cls.CONFIRMATION_LENGTH
+            block_height = cls.CURRENT_HEIGHT - num_confirmation
             tx_id = '_'.join([random_string(), str(block_height), str(num_confirmation)])
-            Share.objects.create(miner=self.miners[0], transaction_id=tx_id, difficulty=1,
-                                 block_height=block_height, status='solved', parent_id='1',
-                                 pow_identity=default_hash)
+            shares.append(Share(miner=cls.miners[0], transaction_id=tx_id, difficulty=1,
+                                block_height=block_height, status='solved', parent_id='1',
+                                pow_identity=default_hash))
 
             # unconfirmed shares
-            num_confirmation = CONFIRMATION_LENGTH - 10
-            block_height = self.CURRENT_HEIGHT - num_confirmation
+            num_confirmation = cls.CONFIRMATION_LENGTH - 10
+            block_height = cls.CURRENT_HEIGHT - num_confirmation
             tx_id = '_'.join([random_string(), str(block_height), str(num_confirmation)])
-            Share.objects.create(miner=self.miners[0], transaction_id=tx_id, difficulty=1,
-                                 block_height=block_height, status='solved', parent_id='1',
-                                 pow_identity=default_hash)
+            shares.append(Share(miner=cls.miners[0], transaction_id=tx_id, difficulty=1,
+                                block_height=block_height, status='solved', parent_id='1',
+                                pow_identity=default_hash))
+
+        shares = Share.objects.bulk_create(shares)
 
         # by default all shares have immature balances for each miner
-        for share in Share.objects.filter(status='solved'):
-            for miner in self.miners:
-                Balance.objects.create(share=share, miner=miner, balance=int(100e9), status='immature')
-                Balance.objects.create(share=share, miner=miner, balance=int(100e9), status='mature')
-                Balance.objects.create(miner=miner, balance=int(-20e9), status='withdraw')
+        balances = []
+        for share in [share for share in shares if share.status == 'solved']:
+            for miner in cls.miners:
+                balances += [Balance(share=share, miner=miner, balance=int(100e9), status='immature'),
+                             Balance(share=share, miner=miner, balance=int(100e9), status='mature'),
+                             Balance(miner=miner, balance=int(-20e9), status='withdraw')]
+        Balance.objects.bulk_create(balances)
 
     @patch('core.tasks.node_request', side_effect=mocked_node_request)
     @patch('core.tasks.RewardAlgorithm.perform_logic', side_effect=mocked_reward_algorithm_do_nothing)
@@ -2046,18 +1944,15 @@ class ImmatureToMatureTestCase(TestCase):
         the same 20 shares are confirmed
         """
         current_height = ImmatureToMatureTestCase.CURRENT_HEIGHT
-        CONFIRMATION_LENGTH = Configuration.objects.CONFIRMATION_LENGTH
-        confirmed_shares = [x.id for x in Share.objects.filter(balance__status='immature',
-                                                               block_height__lte=(current_height - CONFIRMATION_LENGTH),
-                                                               status='solved').distinct()]
-        balances_to_status = {
-            balance.id: balance.status for balance in Balance.objects.all()
-        }
+        CONFIRMATION_LENGTH = self.CONFIRMATION_LENGTH
+        confirmed_shares = set(Share.objects.filter(balance__status='immature',
+                                                    block_height__lte=(current_height - CONFIRMATION_LENGTH),
+                                                    status='solved').distinct().values_list('id', flat=True))
+        balances_to_status = dict(Balance.objects.values_list('id', 'status'))
 
         immature_to_mature()
-        for balance_id in balances_to_status.keys():
-            balance = Balance.objects.get(id=balance_id)
-            if balance.share is None or balance.share.id not in confirmed_shares:
+        for balance in Balance.objects.filter(id__in=balances_to_status.keys()):
+            if balance.share_id is None or balance.share_id not in confirmed_shares:
                 self.assertEqual(balance.status, balances_to_status[balance.id])
 
             else:
@@ -2075,17 +1970,15 @@ class ImmatureToMatureTestCase(TestCase):
         """
         Configuration.objects.create(key='REWARD_ALGORITHM', value='PPS')
         current_height = ImmatureToMatureTestCase.CURRENT_HEIGHT
-        CONFIRMATION_LENGTH = Configuration.objects.CONFIRMATION_LENGTH
-        confirmed_shares = [x.id for x in Share.objects.filter(balance__status='immature',
-                                                               block_height__lte=(current_height - CONFIRMATION_LENGTH)).distinct()]
-        balances_to_status = {
-            balance.id: balance.status for balance in Balance.objects.all()
-        }
+        CONFIRMATION_LENGTH = self.CONFIRMATION_LENGTH
+        confirmed_shares = set(Share.objects.filter(balance__status='immature',
+                                                    block_height__lte=(current_height - CONFIRMATION_LENGTH))
+                               .distinct().values_list('id', flat=True))
+        balances_to_status = dict(Balance.objects.values_list('id', 'status'))
 
         immature_to_mature()
-        for balance_id in balances_to_status.keys():
-            balance = Balance.objects.get(id=balance_id)
-            if balance.share is None or balance.share.id not in confirmed_shares:
+        for balance in Balance.objects.filter(id__in=balances_to_status.keys()):
+            if balance.share_id is None or balance.share_id not in confirmed_shares:
                 self.assertEqual(balance.status, balances_to_status[balance.id])
             else:
                 if balances_to_status[balance.id] == "immature":
@@ -2102,50 +1995,43 @@ class ImmatureToMatureTestCase(TestCase):
         some confirmed share has issues because its next ids are present in blockchain
         """
         current_height = ImmatureToMatureTestCase.CURRENT_HEIGHT
-        CONFIRMATION_LENGTH = Configuration.objects.CONFIRMATION_LENGTH
-        cur_unconfirmed = Share.objects.filter(balance__status='immature',
-                                               block_height=(current_height - CONFIRMATION_LENGTH),
-                                               status='solved').distinct()[:5]
+        CONFIRMATION_LENGTH = self.CONFIRMATION_LENGTH
+        confirmable_shares = list(Share.objects.filter(balance__status='immature',
+                                                       block_height__lte=(current_height - CONFIRMATION_LENGTH),
+                                                       status='solved').distinct())
+        cur_unconfirmed = [x for x in confirmable_shares
+                           if x.block_height == current_height - CONFIRMATION_LENGTH][:5]
         for share in cur_unconfirmed:
             num_confirmed = int(share.transaction_id.split('_')[-1])
             share.transaction_id = '_'.join([random_string(), str(share.block_height), str(num_confirmed - 1)])
-            share.save()
+        Share.objects.bulk_update(cur_unconfirmed, ['transaction_id'])
 
-        cur_unconfirmed = [x.id for x in cur_unconfirmed]
+        cur_unconfirmed = {x.id for x in cur_unconfirmed}
 
-        confirmed_shares = [x.id for x in Share.objects.filter(balance__status='immature',
-                                                               block_height__lte=(current_height - CONFIRMATION_LENGTH),
-                                                               status='solved').distinct() if
-                            x.id not in cur_unconfirmed]
+        confirmed_shares = [x.id for x in confirmable_shares if x.id not in cur_unconfirmed]
         conf = Share.objects.get(id=confirmed_shares[0])
-        conf.next_ids = ['1']
-        conf.save()
         val = Share.objects.filter(status='valid').first()
-        val.next_ids = ['1']
-        val.save()
-        conf_balances = [b.id for b in Balance.objects.filter(share=conf, status='immature')]
+        Share.objects.filter(id__in=[conf.id, val.id]).update(next_ids=['1'])
+        conf_balances = list(Balance.objects.filter(share=conf, status='immature')
+                             .values_list('miner__public_key', 'balance'))
 
-        balances_to_status = {
-            balance.id: balance.status for balance in Balance.objects.all()
-        }
+        balances_to_status = dict(Balance.objects.values_list('id', 'status'))
 
-        total_bal_count = Balance.objects.all().count()
+        total_bal_count = Balance.objects.count()
         immature_to_mature()
-        for id in conf_balances:
-            b = Balance.objects.get(id=id)
-            self.assertEqual(Balance.objects.filter(miner=b.miner, status='mature',
-                                                    balance=-b.balance, share=conf).count(), 1)
+        mature_counts = get_balance_counts(share=conf, status='mature')
+        reverted = {(miner, -balance) for miner, balance in conf_balances}
+        self.assertEqual({key: mature_counts.get(key) for key in reverted}, dict.fromkeys(reverted, 1))
 
-        self.assertEqual(Balance.objects.all().count(), total_bal_count + len(conf_balances))
+        self.assertEqual(Balance.objects.count(), total_bal_count + len(conf_balances))
 
         conf = Share.objects.get(id=conf.id)
         self.assertTrue(conf.is_orphaned)
         val = Share.objects.get(id=val.id)
         self.assertTrue(val.is_orphaned)
 
-        for balance_id in balances_to_status.keys():
-            balance = Balance.objects.get(id=balance_id)
-            if balance.share is None or balance.share.id not in confirmed_shares:
+        for balance in Balance.objects.filter(id__in=balances_to_status.keys()):
+            if balance.share_id is None or balance.share_id not in confirmed_shares:
                 self.assertEqual(balance.status, balances_to_status[balance.id])
 
             else:
@@ -2164,53 +2050,44 @@ class ImmatureToMatureTestCase(TestCase):
         reward algorithm must be called for ok and confirmed solved shares
         """
         current_height = ImmatureToMatureTestCase.CURRENT_HEIGHT
-        CONFIRMATION_LENGTH = Configuration.objects.CONFIRMATION_LENGTH
-        cur_unconfirmed = Share.objects.filter(balance__status='immature',
-                                               block_height=(current_height - CONFIRMATION_LENGTH),
-                                               status='solved').distinct()[:5]
+        CONFIRMATION_LENGTH = self.CONFIRMATION_LENGTH
+        confirmable_shares = list(Share.objects.filter(balance__status='immature',
+                                                       block_height__lte=(current_height - CONFIRMATION_LENGTH),
+                                                       status='solved').distinct())
+        cur_unconfirmed = [x for x in confirmable_shares
+                           if x.block_height == current_height - CONFIRMATION_LENGTH][:5]
         for share in cur_unconfirmed:
             num_confirmed = int(share.transaction_id.split('_')[-1])
             share.transaction_id = '_'.join([random_string(), str(share.block_height), str(num_confirmed - 1)])
-            share.save()
+        Share.objects.bulk_update(cur_unconfirmed, ['transaction_id'])
 
-        cur_unconfirmed = [x.id for x in cur_unconfirmed]
+        cur_unconfirmed = {x.id for x in cur_unconfirmed}
 
-        confirmed_shares_id = [x.id for x in Share.objects.filter(balance__status='immature',
-                                                                  block_height__lte=(
-                                                                          current_height - CONFIRMATION_LENGTH),
-                                                                  status='solved').distinct() if
-                               x.id not in cur_unconfirmed]
-
-        confirmed_shares = [x for x in Share.objects.filter(balance__status='immature',
-                                                            block_height__lte=(current_height - CONFIRMATION_LENGTH),
-                                                            status='solved').distinct() if
-                            x.id not in cur_unconfirmed]
+        confirmed_shares = [x for x in confirmable_shares if x.id not in cur_unconfirmed]
+        confirmed_shares_id = [x.id for x in confirmed_shares]
         conf = Share.objects.get(id=confirmed_shares_id[0])
         conf.next_ids = ['1']
         conf.save()
-        conf_balances = [b.id for b in Balance.objects.filter(share=conf, status='immature')]
+        conf_balances = list(Balance.objects.filter(share=conf, status='immature')
+                             .values_list('miner__public_key', 'balance'))
 
-        balances_to_status = {
-            balance.id: balance.status for balance in Balance.objects.all()
-        }
+        balances_to_status = dict(Balance.objects.values_list('id', 'status'))
 
-        total_bal_count = Balance.objects.all().count()
+        total_bal_count = Balance.objects.count()
         immature_to_mature()
-        for id in conf_balances:
-            b = Balance.objects.get(id=id)
-            self.assertEqual(Balance.objects.filter(miner=b.miner, status='mature',
-                                                    balance=-b.balance, share=conf).count(), 1)
+        mature_counts = get_balance_counts(share=conf, status='mature')
+        reverted = {(miner, -balance) for miner, balance in conf_balances}
+        self.assertEqual({key: mature_counts.get(key) for key in reverted}, dict.fromkeys(reverted, 1))
 
-        self.assertEqual(Balance.objects.all().count(), total_bal_count + len(conf_balances))
+        self.assertEqual(Balance.objects.count(), total_bal_count + len(conf_balances))
 
         conf = Share.objects.get(id=conf.id)
         self.assertTrue(conf.is_orphaned)
 
         logic.assert_has_calls([call(share) for share in confirmed_shares if share.id != conf.id])
 
-        for balance_id in balances_to_status.keys():
-            balance = Balance.objects.get(id=balance_id)
-            if balance.share is None or balance.share.id not in confirmed_shares_id:
+        for balance in Balance.objects.filter(id__in=balances_to_status.keys()):
+            if balance.share_id is None or balance.share_id not in confirmed_shares_id:
                 self.assertEqual(balance.status, balances_to_status[balance.id])
 
             else:
@@ -2229,52 +2106,42 @@ class ImmatureToMatureTestCase(TestCase):
         balances created in reward algorithm must be converted to mature too
         """
         current_height = ImmatureToMatureTestCase.CURRENT_HEIGHT
-        CONFIRMATION_LENGTH = Configuration.objects.CONFIRMATION_LENGTH
-        cur_unconfirmed = Share.objects.filter(balance__status='immature',
-                                               block_height=(current_height - CONFIRMATION_LENGTH),
-                                               status='solved').distinct()[:5]
+        CONFIRMATION_LENGTH = self.CONFIRMATION_LENGTH
+        confirmable_shares = list(Share.objects.filter(balance__status='immature',
+                                                       block_height__lte=(current_height - CONFIRMATION_LENGTH),
+                                                       status='solved').distinct())
+        cur_unconfirmed = [x for x in confirmable_shares
+                           if x.block_height == current_height - CONFIRMATION_LENGTH][:5]
         for share in cur_unconfirmed:
             num_confirmed = int(share.transaction_id.split('_')[-1])
             share.transaction_id = '_'.join([random_string(), str(share.block_height), str(num_confirmed - 1)])
-            share.save()
+        Share.objects.bulk_update(cur_unconfirmed, ['transaction_id'])
 
-        cur_unconfirmed = [x.id for x in cur_unconfirmed]
+        cur_unconfirmed = {x.id for x in cur_unconfirmed}
 
-        confirmed_shares_id = [x.id for x in Share.objects.filter(balance__status='immature',
-                                                                  block_height__lte=(
-                                                                          current_height - CONFIRMATION_LENGTH),
-                                                                  status='solved').distinct() if
-                               x.id not in cur_unconfirmed]
-
-        confirmed_shares = [x for x in Share.objects.filter(balance__status='immature',
-                                                            block_height__lte=(current_height - CONFIRMATION_LENGTH),
-                                                            status='solved').distinct() if
-                            x.id not in cur_unconfirmed]
-        balances_to_status = {
-            balance.id: balance.status for balance in Balance.objects.all()
-        }
+        confirmed_shares = [x for x in confirmable_shares if x.id not in cur_unconfirmed]
+        confirmed_shares_id = [x.id for x in confirmed_shares]
+        balances_to_status = dict(Balance.objects.values_list('id', 'status'))
 
         immature_to_mature()
 
         logic.assert_has_calls([call(share) for share in confirmed_shares if share.id])
 
         for share in confirmed_shares:
-            miners = Miner.objects.all()
-            for miner in miners[:5]:
+            for miner in self.miners[:5]:
                 bal = Balance.objects.filter(miner=miner, share=share, balance=-10)
                 self.assertEqual(bal.count(), 1)
                 self.assertEqual(bal.first().status, 'mature')
                 self.assertTrue(bal.first().is_orphaned)
 
-            for miner in miners[5:]:
+            for miner in self.miners[5:]:
                 bal = Balance.objects.filter(miner=miner, share=share, balance=10)
                 self.assertEqual(bal.count(), 1)
                 self.assertEqual(bal.first().status, 'mature')
                 self.assertTrue(not bal.first().is_orphaned)
 
-        for balance_id in balances_to_status.keys():
-            balance = Balance.objects.get(id=balance_id)
-            if balance.share is None or balance.share.id not in confirmed_shares_id:
+        for balance in Balance.objects.filter(id__in=balances_to_status.keys()):
+            if balance.share_id is None or balance.share_id not in confirmed_shares_id:
                 self.assertEqual(balance.status, balances_to_status[balance.id])
 
             else:
@@ -2293,50 +2160,43 @@ class ImmatureToMatureTestCase(TestCase):
         some confirmed share has issues because its parent id is not present in the blockchain
         """
         current_height = ImmatureToMatureTestCase.CURRENT_HEIGHT
-        CONFIRMATION_LENGTH = Configuration.objects.CONFIRMATION_LENGTH
-        cur_unconfirmed = Share.objects.filter(balance__status='immature',
-                                               block_height=(current_height - CONFIRMATION_LENGTH),
-                                               status='solved').distinct()[:5]
+        CONFIRMATION_LENGTH = self.CONFIRMATION_LENGTH
+        confirmable_shares = list(Share.objects.filter(balance__status='immature',
+                                                       block_height__lte=(current_height - CONFIRMATION_LENGTH),
+                                                       status='solved').distinct())
+        cur_unconfirmed = [x for x in confirmable_shares
+                           if x.block_height == current_height - CONFIRMATION_LENGTH][:5]
         for share in cur_unconfirmed:
             num_confirmed = int(share.transaction_id.split('_')[-1])
             share.transaction_id = '_'.join([random_string(), str(share.block_height), str(num_confirmed - 1)])
-            share.save()
+        Share.objects.bulk_update(cur_unconfirmed, ['transaction_id'])
 
-        cur_unconfirmed = [x.id for x in cur_unconfirmed]
+        cur_unconfirmed = {x.id for x in cur_unconfirmed}
 
-        confirmed_shares = [x.id for x in Share.objects.filter(balance__status='immature',
-                                                               block_height__lte=(current_height - CONFIRMATION_LENGTH),
-                                                               status='solved').distinct() if
-                            x.id not in cur_unconfirmed]
+        confirmed_shares = [x.id for x in confirmable_shares if x.id not in cur_unconfirmed]
         conf = Share.objects.get(id=confirmed_shares[0])
-        conf.parent_id = '1000'
-        conf.save()
         val = Share.objects.filter(status='valid').first()
-        val.parent_id = '1000'
-        val.save()
-        conf_balances = [b.id for b in Balance.objects.filter(share=conf, status='immature')]
+        Share.objects.filter(id__in=[conf.id, val.id]).update(parent_id='1000')
+        conf_balances = list(Balance.objects.filter(share=conf, status='immature')
+                             .values_list('miner__public_key', 'balance'))
 
-        balances_to_status = {
-            balance.id: balance.status for balance in Balance.objects.all()
-        }
+        balances_to_status = dict(Balance.objects.values_list('id', 'status'))
 
-        total_bal_count = Balance.objects.all().count()
+        total_bal_count = Balance.objects.count()
         immature_to_mature()
-        for id in conf_balances:
-            b = Balance.objects.get(id=id)
-            self.assertEqual(Balance.objects.filter(miner=b.miner, status='mature',
-                                                    balance=-b.balance, share=conf).count(), 1)
+        mature_counts = get_balance_counts(share=conf, status='mature')
+        reverted = {(miner, -balance) for miner, balance in conf_balances}
+        self.assertEqual({key: mature_counts.get(key) for key in reverted}, dict.fromkeys(reverted, 1))
 
-        self.assertEqual(Balance.objects.all().count(), total_bal_count + len(conf_balances))
+        self.assertEqual(Balance.objects.count(), total_bal_count + len(conf_balances))
 
         conf = Share.objects.get(id=conf.id)
         self.assertTrue(conf.is_orphaned)
         val = Share.objects.get(id=val.id)
         self.assertTrue(val.is_orphaned)
 
-        for balance_id in balances_to_status.keys():
-            balance = Balance.objects.get(id=balance_id)
-            if balance.share is None or balance.share.id not in confirmed_shares:
+        for balance in Balance.objects.filter(id__in=balances_to_status.keys()):
+            if balance.share_id is None or balance.share_id not in confirmed_shares:
                 self.assertEqual(balance.status, balances_to_status[balance.id])
 
             else:
@@ -2355,45 +2215,41 @@ class ImmatureToMatureTestCase(TestCase):
         some solved confirmed share has issues because their pow does not match with pow in the blockchain
         """
         current_height = ImmatureToMatureTestCase.CURRENT_HEIGHT
-        CONFIRMATION_LENGTH = Configuration.objects.CONFIRMATION_LENGTH
-        cur_unconfirmed = Share.objects.filter(balance__status='immature',
-                                               block_height=(current_height - CONFIRMATION_LENGTH),
-                                               status='solved').distinct()[:5]
+        CONFIRMATION_LENGTH = self.CONFIRMATION_LENGTH
+        confirmable_shares = list(Share.objects.filter(balance__status='immature',
+                                                       block_height__lte=(current_height - CONFIRMATION_LENGTH),
+                                                       status='solved').distinct())
+        cur_unconfirmed = [x for x in confirmable_shares
+                           if x.block_height == current_height - CONFIRMATION_LENGTH][:5]
         for share in cur_unconfirmed:
             num_confirmed = int(share.transaction_id.split('_')[-1])
             share.transaction_id = '_'.join([random_string(), str(share.block_height), str(num_confirmed - 1)])
-            share.save()
+        Share.objects.bulk_update(cur_unconfirmed, ['transaction_id'])
 
-        cur_unconfirmed = [x.id for x in cur_unconfirmed]
+        cur_unconfirmed = {x.id for x in cur_unconfirmed}
 
-        confirmed_shares = [x.id for x in Share.objects.filter(balance__status='immature',
-                                                               block_height__lte=(current_height - CONFIRMATION_LENGTH),
-                                                               status='solved').distinct() if
-                            x.id not in cur_unconfirmed]
+        confirmed_shares = [x.id for x in confirmable_shares if x.id not in cur_unconfirmed]
         conf = Share.objects.get(id=confirmed_shares[0])
         conf.pow_identity = 'wrong_hash'
         conf.save()
-        conf_balances = [b.id for b in Balance.objects.filter(share=conf, status='immature')]
+        conf_balances = list(Balance.objects.filter(share=conf, status='immature')
+                             .values_list('miner__public_key', 'balance'))
 
-        balances_to_status = {
-            balance.id: balance.status for balance in Balance.objects.all()
-        }
+        balances_to_status = dict(Balance.objects.values_list('id', 'status'))
 
-        total_bal_count = Balance.objects.all().count()
+        total_bal_count = Balance.objects.count()
         immature_to_mature()
-        for id in conf_balances:
-            b = Balance.objects.get(id=id)
-            self.assertEqual(Balance.objects.filter(miner=b.miner, status='mature',
-                                                    balance=-b.balance, share=conf).count(), 1)
+        mature_counts = get_balance_counts(share=conf, status='mature')
+        reverted = {(miner, -balance) for miner, balance in conf_balances}
+        self.assertEqual({key: mature_counts.get(key) for key in reverted}, dict.fromkeys(reverted, 1))
 
-        self.assertEqual(Balance.objects.all().count(), total_bal_count + len(conf_balances))
+        self.assertEqual(Balance.objects.count(), total_bal_count + len(conf_balances))
 
         conf = Share.objects.get(id=conf.id)
         self.assertTrue(conf.is_orphaned)
 
-        for balance_id in balances_to_status.keys():
-            balance = Balance.objects.get(id=balance_id)
-            if balance.share is None or balance.share.id not in confirmed_shares:
+        for balance in Balance.objects.filter(id__in=balances_to_status.keys()):
+            if balance.share_id is None or balance.share_id not in confirmed_shares:
                 self.assertEqual(balance.status, balances_to_status[balance.id])
 
             else:
@@ -2412,45 +2268,41 @@ class ImmatureToMatureTestCase(TestCase):
         some solved confirmed share has issues because their tx height does not match with share height
         """
         current_height = ImmatureToMatureTestCase.CURRENT_HEIGHT
-        CONFIRMATION_LENGTH = Configuration.objects.CONFIRMATION_LENGTH
-        cur_unconfirmed = Share.objects.filter(balance__status='immature',
-                                               block_height=(current_height - CONFIRMATION_LENGTH),
-                                               status='solved').distinct()[:5]
+        CONFIRMATION_LENGTH = self.CONFIRMATION_LENGTH
+        confirmable_shares = list(Share.objects.filter(balance__status='immature',
+                                                       block_height__lte=(current_height - CONFIRMATION_LENGTH),
+                                                       status='solved').distinct())
+        cur_unconfirmed = [x for x in confirmable_shares
+                           if x.block_height == current_height - CONFIRMATION_LENGTH][:5]
         for share in cur_unconfirmed:
             num_confirmed = int(share.transaction_id.split('_')[-1])
             share.transaction_id = '_'.join([random_string(), str(share.block_height), str(num_confirmed - 1)])
-            share.save()
+        Share.objects.bulk_update(cur_unconfirmed, ['transaction_id'])
 
-        cur_unconfirmed = [x.id for x in cur_unconfirmed]
+        cur_unconfirmed = {x.id for x in cur_unconfirmed}
 
-        confirmed_shares = [x.id for x in Share.objects.filter(balance__status='immature',
-                                                               block_height__lte=(current_height - CONFIRMATION_LENGTH),
-                                                               status='solved').distinct() if
-                            x.id not in cur_unconfirmed]
+        confirmed_shares = [x.id for x in confirmable_shares if x.id not in cur_unconfirmed]
         conf = Share.objects.get(id=confirmed_shares[0])
         conf.block_height = 10
         conf.save()
-        conf_balances = [b.id for b in Balance.objects.filter(share=conf, status='immature')]
+        conf_balances = list(Balance.objects.filter(share=conf, status='immature')
+                             .values_list('miner__public_key', 'balance'))
 
-        balances_to_status = {
-            balance.id: balance.status for balance in Balance.objects.all()
-        }
+        balances_to_status = dict(Balance.objects.values_list('id', 'status'))
 
-        total_bal_count = Balance.objects.all().count()
+        total_bal_count = Balance.objects.count()
         immature_to_mature()
-        for id in conf_balances:
-            b = Balance.objects.get(id=id)
-            self.assertEqual(Balance.objects.filter(miner=b.miner, status='mature',
-                                                    balance=-b.balance, share=conf).count(), 1)
+        mature_counts = get_balance_counts(share=conf, status='mature')
+        reverted = {(miner, -balance) for miner, balance in conf_balances}
+        self.assertEqual({key: mature_counts.get(key) for key in reverted}, dict.fromkeys(reverted, 1))
 
-        self.assertEqual(Balance.objects.all().count(), total_bal_count + len(conf_balances))
+        self.assertEqual(Balance.objects.count(), total_bal_count + len(conf_balances))
 
         conf = Share.objects.get(id=conf.id)
         self.assertTrue(conf.is_orphaned)
 
-        for balance_id in balances_to_status.keys():
-            balance = Balance.objects.get(id=balance_id)
-            if balance.share is None or balance.share.id not in confirmed_shares:
+        for balance in Balance.objects.filter(id__in=balances_to_status.keys()):
+            if balance.share_id is None or balance.share_id not in confirmed_shares:
                 self.assertEqual(balance.status, balances_to_status[balance.id])
 
             else:
@@ -2467,23 +2319,20 @@ class ImmatureToMatureTestCase(TestCase):
         0 of these shares are confirmed
         """
         current_height = ImmatureToMatureTestCase.CURRENT_HEIGHT
-        CONFIRMATION_LENGTH = Configuration.objects.CONFIRMATION_LENGTH
-        cur_unconfirmed = Share.objects.filter(balance__status='immature',
-                                               block_height__lte=(current_height - CONFIRMATION_LENGTH),
-                                               status='solved').distinct()
+        CONFIRMATION_LENGTH = self.CONFIRMATION_LENGTH
+        cur_unconfirmed = list(Share.objects.filter(balance__status='immature',
+                                                    block_height__lte=(current_height - CONFIRMATION_LENGTH),
+                                                    status='solved').distinct())
         for share in cur_unconfirmed:
             num_confirmed = int(share.transaction_id.split('_')[-1])
             share.transaction_id = '_'.join([random_string(), str(num_confirmed - 100)])
             share.block_height += 100
-            share.save()
+        Share.objects.bulk_update(cur_unconfirmed, ['transaction_id', 'block_height'])
 
-        balances_to_status = {
-            balance.id: balance.status for balance in Balance.objects.all()
-        }
+        balances_to_status = dict(Balance.objects.values_list('id', 'status'))
 
         immature_to_mature()
-        for balance in Balance.objects.all():
-            self.assertEqual(balance.status, balances_to_status[balance.id])
+        self.assertEqual(dict(Balance.objects.values_list('id', 'status')), balances_to_status)
 
     @patch('core.tasks.node_request', side_effect=mocked_node_request)
     def test_0_shares_possible_0_confirmed(self, mocked_node_request):
@@ -2492,31 +2341,14 @@ class ImmatureToMatureTestCase(TestCase):
         0 of these shares are confirmed
         """
         current_height = ImmatureToMatureTestCase.CURRENT_HEIGHT
-        CONFIRMATION_LENGTH = Configuration.objects.CONFIRMATION_LENGTH
-        cur_unconfirmed = Share.objects.filter(balance__status='immature',
-                                               block_height__lte=(current_height - CONFIRMATION_LENGTH),
-                                               status='solved').distinct()
-        for share in cur_unconfirmed:
-            share.block_height = current_height
-            share.save()
+        CONFIRMATION_LENGTH = self.CONFIRMATION_LENGTH
+        Share.objects.filter(balance__status='immature', block_height__lte=(current_height - CONFIRMATION_LENGTH),
+                             status='solved').update(block_height=current_height)
 
-        balances_to_status = {
-            balance.id: balance.status for balance in Balance.objects.all()
-        }
+        balances_to_status = dict(Balance.objects.values_list('id', 'status'))
 
         immature_to_mature()
-        for balance in Balance.objects.all():
-            self.assertEqual(balance.status, balances_to_status[balance.id])
-
-    def tearDown(self):
-        """
-        tearDown function to clean up objects created in setUp function
-        :return:
-        """
-        Configuration.objects.all().delete()
-        Miner.objects.all().delete()
-        Share.objects.all().delete()
-        Balance.objects.all().delete()
+        self.assertEqual(dict(Balance.objects.values_list('id', 'status')), balances_to_status)
 
 
 @override_settings(KEEP_BALANCE_WITH_DETAIL_NUM=8)
@@ -2528,8 +2360,10 @@ class AggregateTestCase(TestCase):
     """
     Test class for aggregation
     """
+    NOW = datetime(2020, 1, 27, 12, 19, 46, 196633)
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         creating 5 miners
         2 solved share for each
@@ -2537,7 +2371,34 @@ class AggregateTestCase(TestCase):
         for each solved share and each miner create 2 balance,
         one with status mature and one with withdrawal
         """
-        date = '2020-01-27 12:19:46.196633'
+        num_miners = 5
+        cls.miners = Miner.objects.bulk_create([Miner(public_key=str(i)) for i in range(num_miners)])
+
+        cls.solved = []
+        time = timezone.now()
+        for i in range(10):
+            with patch('django.utils.timezone.now', return_value=time - timedelta(seconds=i * 10)):
+                solved_share = Share.objects.create(share=random_string(), miner=cls.miners[i % num_miners],
+                                                    difficulty=int((i + 1) * 1e8),
+                                                    status='solved')
+            cls.solved.insert(0, solved_share)
+
+            balances = []
+            for m in cls.miners:
+                balances += [Balance(miner=m, share=solved_share, balance=int(30e9), status='mature'),
+                             Balance(miner=m, share=solved_share, balance=int(-10e9), status='withdraw')]
+            with patch('django.utils.timezone.now', return_value=solved_share.created_at - timedelta(seconds=1)):
+                Share.objects.bulk_create([
+                    Share(share=random_string(), miner=cls.miners[j % num_miners], difficulty=10, status=stat)
+                    for j in range(8) for stat in ['invalid', 'valid', 'repetitious']
+                ])
+                Balance.objects.bulk_create(balances)
+
+    def setUp(self):
+        """
+        removing csv files left from previous runs
+        """
+        date = str(self.NOW)
         self.shares_detail_file = os.path.join(settings.AGGREGATE_ROOT_FOLDER,
                                                settings.SHARE_DETAIL_FOLDER, date) + '.csv'
         self.shares_aggregate_file = os.path.join(settings.AGGREGATE_ROOT_FOLDER,
@@ -2550,43 +2411,26 @@ class AggregateTestCase(TestCase):
             if os.path.exists(file):
                 os.remove(file)
 
-        num_miners = 5
-        for i in range(num_miners):
-            Miner.objects.create(public_key=str(i))
-
-        self.solved = []
-        time = timezone.now()
-        for i in range(10):
-            solved_share = Share.objects.create(share=random_string(), miner=Miner.objects.all()[i % num_miners],
-                                                difficulty=int((i + 1) * 1e8),
-                                                status='solved')
-            Share.objects.filter(id=solved_share.id).update(created_at=time - timedelta(seconds=i * 10))
-            solved_share = Share.objects.get(id=solved_share.id)
-            self.solved.insert(0, solved_share)
-
-            for j in range(8):
-                for stat in ['invalid', 'valid', 'repetitious']:
-                    share = Share.objects.create(share=random_string(), miner=Miner.objects.all()[j % num_miners],
-                                                 difficulty=10, status=stat)
-                    Share.objects.filter(id=share.id).update(created_at=time - timedelta(seconds=i * 10 + 1))
-
-            for m in Miner.objects.all():
-                b = Balance.objects.create(miner=m, share=solved_share, balance=int(30e9), status='mature')
-                Balance.objects.filter(id=b.id).update(created_at=solved_share.created_at - timedelta(seconds=1))
-                b = Balance.objects.create(miner=m, share=solved_share, balance=int(-10e9), status='withdraw')
-                Balance.objects.filter(id=b.id).update(created_at=solved_share.created_at - timedelta(seconds=1))
+    def assert_csv_content(self, filename, expected_content):
+        """
+        checks the file exists and has the lines of expected content in any order
+        :param filename: path of the written csv file
+        :param expected_content: csv bytes the file must have
+        """
+        self.assertTrue(os.path.exists(filename))
+        with open(filename, 'rb') as file:
+            self.assertCountEqual(file.read().splitlines(), expected_content.splitlines())
 
     def test_share_all_with_detail(self, mocked_time):
         """
         first time running the aggregate function
         all shares and balances are present
         """
-        mocked_time.now.return_value = datetime.strptime('2020-01-27 12:19:46.196633',
-                                                         '%Y-%m-%d %H:%M:%S.%f')
+        mocked_time.now.return_value = self.NOW
 
         share = self.solved[:-settings.KEEP_SHARES_WITH_DETAIL_NUM][-1]
         shares = Share.objects.filter(status__in=['valid', 'invalid', 'repetitious'], created_at__lte=share.created_at)
-        share_detail_content = shares.to_csv().decode('utf-8')
+        share_detail_content = shares.to_csv()
         aggregate()
 
         # all shares in last 5 rounds must remain with details
@@ -2602,14 +2446,12 @@ class AggregateTestCase(TestCase):
             # the solved share must remain
             self.assertEqual(Share.objects.filter(id=solved.id).count(), 1)
             self.assertEqual(Share.objects.filter(created_at=solved.created_at - timedelta(seconds=1)).count(), 0)
-            for miner in Miner.objects.all():
-                self.assertEqual(AggregateShare.objects.filter(miner=miner, solved_share=solved).count(), 1)
-                agg = AggregateShare.objects.get(miner=miner, solved_share=solved)
-                parameters = [agg.valid_num, agg.invalid_num, agg.repetitious_num, agg.difficulty_sum]
-                if miner.public_key in ['0', '1', '2']:
-                    self.assertEqual(parameters, [2, 2, 2, 60])
-                else:
-                    self.assertEqual(parameters, [1, 1, 1, 30])
+            aggregates = AggregateShare.objects.filter(solved_share=solved).order_by('miner__public_key').values_list(
+                'miner__public_key', 'valid_num', 'invalid_num', 'repetitious_num', 'difficulty_sum')
+            self.assertEqual(list(aggregates), [
+                (miner.public_key, 2, 2, 2, 60) if miner.public_key in ['0', '1', '2']
+                else (miner.public_key, 1, 1, 1, 30) for miner in self.miners
+            ])
             self.assertEqual(Share.objects.get(id=solved.id).is_aggregated, True)
 
         # all other rounds must be aggregated and removed
@@ -2619,40 +2461,36 @@ class AggregateTestCase(TestCase):
             self.assertEqual(Share.objects.filter(created_at=solved.created_at - timedelta(seconds=1)).count(), 0)
             self.assertEqual(AggregateShare.objects.filter(solved_share=solved).count(), 0)
 
-        self.assertTrue(os.path.exists(self.shares_detail_file))
-        with open(self.shares_detail_file, 'r') as file:
-            content = sorted(file.read().split('\n'))
-            self.assertEqual(sorted(share_detail_content.split('\n')), content)
+        self.assert_csv_content(self.shares_detail_file, share_detail_content)
 
         self.assertTrue(os.path.exists(self.shares_aggregate_file))
-        with open(self.shares_aggregate_file, 'r') as file:
-            content = file.read().rstrip()
-            content = content.split('\n')
-            self.assertEqual(len(content), 11)
+        # header and one row per miner for each of the two removed rounds, those rows are deleted so only counted
+        with open(self.shares_aggregate_file, 'rb') as file:
+            self.assertEqual(len(file.read().splitlines()), 11)
 
     def test_share_6_with_detail_other_aggregated(self, mocked_time):
         """
         some aggregated must be removed, some details must be aggregated
         """
-        mocked_time.now.return_value = datetime.strptime('2020-01-27 12:19:46.196633',
-                                                         '%Y-%m-%d %H:%M:%S.%f')
+        mocked_time.now.return_value = self.NOW
 
         shares = Share.objects.filter(created_at=self.solved[4].created_at - timedelta(seconds=1))
-        share_detail_content = shares.to_csv().decode('utf-8')
+        share_detail_content = shares.to_csv()
 
+        Share.objects.filter(id__in=[solved.id for solved in self.solved[:4]]).update(is_aggregated=True)
+        Share.objects.filter(created_at__in=[solved.created_at - timedelta(seconds=1)
+                                             for solved in self.solved[:4]]).delete()
+        aggregate_shares = []
         for solved in self.solved[:4]:
-            solved.is_aggregated = True
-            solved.save()
-            Share.objects.filter(created_at=solved.created_at - timedelta(seconds=1)).delete()
-            for miner in Miner.objects.all():
+            for miner in self.miners:
                 if miner.public_key in ['0', '1', '2']:
-                    AggregateShare.objects.create(miner=miner, solved_share=solved, valid_num=2,
-                                                  invalid_num=2, repetitious_num=2, difficulty_sum=60)
+                    aggregate_shares.append(AggregateShare(miner=miner, solved_share=solved, valid_num=2,
+                                                           invalid_num=2, repetitious_num=2, difficulty_sum=60))
                 else:
-                    AggregateShare.objects.create(miner=miner, solved_share=solved, valid_num=1,
-                                                  invalid_num=1, repetitious_num=1, difficulty_sum=30)
-        share_aggregate_content = AggregateShare.objects.filter(solved_share__in=self.solved[:2]). \
-            to_csv().decode('utf-8')
+                    aggregate_shares.append(AggregateShare(miner=miner, solved_share=solved, valid_num=1,
+                                                           invalid_num=1, repetitious_num=1, difficulty_sum=30))
+        AggregateShare.objects.bulk_create(aggregate_shares)
+        share_aggregate_content = AggregateShare.objects.filter(solved_share__in=self.solved[:2]).to_csv()
 
         aggregate()
 
@@ -2666,8 +2504,8 @@ class AggregateTestCase(TestCase):
 
         # 5th round must remain aggregated
         for solved in self.solved[2:5]:
-            for miner in Miner.objects.all():
-                self.assertEqual(AggregateShare.objects.filter(miner=miner, solved_share=solved).count(), 1)
+            self.assertEqual(get_aggregate_share_counts(solved_share=solved),
+                             {miner.public_key: 1 for miner in self.miners})
             self.assertEqual(Share.objects.get(id=solved.id).is_aggregated, True)
 
         # 2 aggregated rounds must be removed
@@ -2677,41 +2515,37 @@ class AggregateTestCase(TestCase):
             self.assertEqual(Share.objects.filter(created_at=solved.created_at - timedelta(seconds=1)).count(), 0)
             self.assertEqual(AggregateShare.objects.filter(solved_share=solved).count(), 0)
 
-        for filename, expected_content in [(self.shares_aggregate_file, share_aggregate_content),
-                                           (self.shares_detail_file, share_detail_content)]:
-            self.assertTrue(os.path.exists(filename))
-            with open(filename, 'r') as file:
-                content = sorted(file.read().split('\n'))
-                self.assertEqual(sorted(expected_content.split('\n')), content)
+        self.assert_csv_content(self.shares_aggregate_file, share_aggregate_content)
+        self.assert_csv_content(self.shares_detail_file, share_detail_content)
 
     def test_share_6_with_detail_other_aggregated_some_miners_not_exist_in_round(self, mocked_time):
         """
         some aggregated must be removed, some details must be aggregated
         some miners are not in the round to be aggregate, no aggregate object must be created for that miner
         """
-        mocked_time.now.return_value = datetime.strptime('2020-01-27 12:19:46.196633',
-                                                         '%Y-%m-%d %H:%M:%S.%f')
+        mocked_time.now.return_value = self.NOW
         # first miner is not present in 5th round, so nothing must be aggregated for him
         Share.objects.filter(created_at=self.solved[4].created_at - timedelta(seconds=1),
-                             miner=Miner.objects.all()[0]).delete()
+                             miner=self.miners[0]).delete()
 
         share_detail_content = Share.objects.filter(created_at=self.solved[4].created_at - timedelta(seconds=1)). \
-            to_csv().decode('utf-8')
+            to_csv()
 
+        Share.objects.filter(id__in=[solved.id for solved in self.solved[:4]]).update(is_aggregated=True)
+        Share.objects.filter(created_at__in=[solved.created_at - timedelta(seconds=1)
+                                             for solved in self.solved[:4]]).delete()
+        aggregate_shares = []
         for solved in self.solved[:4]:
-            solved.is_aggregated = True
-            solved.save()
-            Share.objects.filter(created_at=solved.created_at - timedelta(seconds=1)).delete()
-            for miner in Miner.objects.all():
+            for miner in self.miners:
                 if miner.public_key in ['0', '1', '2']:
-                    AggregateShare.objects.create(miner=miner, solved_share=solved, valid_num=2,
-                                                  invalid_num=2, repetitious_num=2, difficulty_sum=60)
+                    aggregate_shares.append(AggregateShare(miner=miner, solved_share=solved, valid_num=2,
+                                                           invalid_num=2, repetitious_num=2, difficulty_sum=60))
                 else:
-                    AggregateShare.objects.create(miner=miner, solved_share=solved, valid_num=1,
-                                                  invalid_num=1, repetitious_num=1, difficulty_sum=30)
+                    aggregate_shares.append(AggregateShare(miner=miner, solved_share=solved, valid_num=1,
+                                                           invalid_num=1, repetitious_num=1, difficulty_sum=30))
+        AggregateShare.objects.bulk_create(aggregate_shares)
 
-        share_aggregate_content = AggregateShare.objects.filter(solved_share__in=self.solved[:2]). \
-            to_csv().decode('utf-8')
+        share_aggregate_content = AggregateShare.objects.filter(solved_share__in=self.solved[:2]).to_csv()
 
         aggregate()
 
@@ -2726,14 +2560,12 @@ class AggregateTestCase(TestCase):
         # 2 rounds must remain aggregated with all miners
         for solved in self.solved[2:4]:
             self.assertEqual(Share.objects.get(id=solved.id).is_aggregated, True)
-            for miner in Miner.objects.all():
-                self.assertEqual(AggregateShare.objects.filter(miner=miner, solved_share=solved).count(), 1)
+            self.assertEqual(get_aggregate_share_counts(solved_share=solved),
+                             {miner.public_key: 1 for miner in self.miners})
 
         # one round must be aggregated with all miners except the first onw
-        for miner in Miner.objects.all()[1:]:
-            self.assertEqual(AggregateShare.objects.filter(miner=miner, solved_share=self.solved[4]).count(), 1)
-        self.assertEqual(
-            AggregateShare.objects.filter(miner=Miner.objects.all()[0], solved_share=self.solved[4]).count(), 0)
+        self.assertEqual(get_aggregate_share_counts(solved_share=self.solved[4]),
+                         {miner.public_key: 1 for miner in self.miners[1:]})
 
         # 2 aggregated rounds must be removed
         for solved in self.solved[:2]:
@@ -2742,39 +2574,32 @@ class AggregateTestCase(TestCase):
             self.assertEqual(Share.objects.filter(created_at=solved.created_at - timedelta(seconds=1)).count(), 0)
             self.assertEqual(AggregateShare.objects.filter(solved_share=solved).count(), 0)
 
-        for filename, expected_content in [(self.shares_aggregate_file, share_aggregate_content),
-                                           (self.shares_detail_file, share_detail_content)]:
-            self.assertTrue(os.path.exists(filename))
-            with open(filename, 'r') as file:
-                content = sorted(file.read().split('\n'))
-                self.assertEqual(sorted(expected_content.split('\n')), content)
+        self.assert_csv_content(self.shares_aggregate_file, share_aggregate_content)
+        self.assert_csv_content(self.shares_detail_file, share_detail_content)
 
     def test_share_5_detail_3_aggregated(self, mocked_time):
         """
         all ok, nothing should happen
         """
-        mocked_time.now.return_value = datetime.strptime('2020-01-27 12:19:46.196633',
-                                                         '%Y-%m-%d %H:%M:%S.%f')
-        mocked_time.now.return_value = datetime.strptime('2020-01-27 12:19:46.196633',
-                                                         '%Y-%m-%d %H:%M:%S.%f')
-        for solved in self.solved[:2]:
-            solved.is_aggregated = True
-            solved.save()
-            Share.objects.filter(created_at=solved.created_at - timedelta(seconds=1)).delete()
+        mocked_time.now.return_value = self.NOW
+        Share.objects.filter(id__in=[solved.id for solved in self.solved[:5]]).update(is_aggregated=True)
+        Share.objects.filter(created_at__in=[solved.created_at - timedelta(seconds=1)
+                                             for solved in self.solved[:5]]).delete()
 
+        aggregate_shares = []
         for solved in self.solved[2:5]:
-            solved.is_aggregated = True
-            solved.save()
-            Share.objects.filter(created_at=solved.created_at - timedelta(seconds=1)).delete()
-            for miner in Miner.objects.all():
+            for miner in self.miners:
                 if miner.public_key in ['0', '1', '2']:
-                    AggregateShare.objects.create(miner=miner, solved_share=solved, valid_num=2,
-                                                  invalid_num=2, repetitious_num=2, difficulty_sum=60)
+                    aggregate_shares.append(AggregateShare(miner=miner, solved_share=solved, valid_num=2,
+                                                           invalid_num=2, repetitious_num=2, difficulty_sum=60))
                 else:
-                    AggregateShare.objects.create(miner=miner, solved_share=solved, valid_num=1,
-                                                  invalid_num=1, repetitious_num=1, difficulty_sum=30)
+                    aggregate_shares.append(AggregateShare(miner=miner, solved_share=solved, valid_num=1,
+                                                           invalid_num=1, repetitious_num=1, difficulty_sum=30))
+        AggregateShare.objects.bulk_create(aggregate_shares)
 
-        aggregate()
+        # query count of aggregate is pinned for this fixture, a change means its queries changed
+        with self.assertNumQueries(15):
+            aggregate()
 
         # all shares in last 5 rounds must remain with details
         for solved in self.solved[-5:]:
@@ -2786,8 +2611,8 @@ class AggregateTestCase(TestCase):
 
         for solved in self.solved[2:5]:
             self.assertEqual(Share.objects.get(id=solved.id).is_aggregated, True)
-            for miner in Miner.objects.all():
-                self.assertEqual(AggregateShare.objects.filter(miner=miner, solved_share=solved).count(), 1)
+            self.assertEqual(get_aggregate_share_counts(solved_share=solved),
+                             {miner.public_key: 1 for miner in self.miners})
 
         self.assertTrue(not os.path.exists(self.shares_aggregate_file))
         self.assertTrue(not os.path.exists(self.shares_detail_file))
@@ -2796,150 +2621,113 @@ class AggregateTestCase(TestCase):
         """
         all balances are with details
         """
-        mocked_time.now.return_value = datetime.strptime('2020-01-27 12:19:46.196633',
-                                                         '%Y-%m-%d %H:%M:%S.%f')
+        mocked_time.now.return_value = self.NOW
         balances = Balance.objects.filter(created_at__lte=self.solved[1].created_at)
         balance_detail_content = balances.to_csv()
-        balance_detail_content = balance_detail_content.decode('utf-8')
 
         aggregate()
 
-        for miner in Miner.objects.all():
-            self.assertEqual(Balance.objects.filter(miner=miner, status='mature', balance=int(60e9)).count(), 1)
-            self.assertEqual(Balance.objects.filter(miner=miner, status='withdraw', balance=int(-20e9)).count(), 1)
+        self.assertEqual(get_balance_counts(share=None, status__in=['mature', 'withdraw']),
+                         {(miner.public_key, balance): 1
+                          for miner in self.miners for balance in [int(60e9), int(-20e9)]})
 
         for solved in self.solved[2:]:
-            for miner in Miner.objects.all():
-                self.assertEqual(Balance.objects.filter(share=solved, miner=miner, status='mature',
-                                                        balance=int(30e9)).count(), 1)
-                self.assertEqual(Balance.objects.filter(share=solved, miner=miner, status='withdraw',
-                                                        balance=int(-10e9)).count(), 1)
-
-        for filename, expected_content in [(self.balance_detail_file, balance_detail_content)]:
-            self.assertTrue(os.path.exists(filename))
-            with open(filename, 'r')as file:
-                content = sorted(file.read().split('\n'))
-                self.assertEqual(sorted(expected_content.split('\n')), content)
+            self.assertEqual(get_balance_counts(share=solved, status='mature'),
+                             {(miner.public_key, int(30e9)): 1 for miner in self.miners})
+            self.assertEqual(get_balance_counts(share=solved, status='withdraw'),
+                             {(miner.public_key, int(-10e9)): 1 for miner in self.miners})
+
+        self.assert_csv_content(self.balance_detail_file, balance_detail_content)
 
     def test_balance_all_with_detail_some_without_share(self, mocked_time):
         """
         all balances are with details
         some balances don't have share filed
         """
-        mocked_time.now.return_value = datetime.strptime('2020-01-27 12:19:46.196633',
-                                                         '%Y-%m-%d %H:%M:%S.%f')
+        mocked_time.now.return_value = self.NOW
 
-        b = Balance.objects.create(miner=Miner.objects.all()[0], balance=int(100e9), status="mature")
-        Balance.objects.filter(id=b.id).update(created_at=self.solved[1].created_at - timedelta(seconds=1))
-        b = Balance.objects.create(miner=Miner.objects.all()[0], balance=int(-50e9), status="withdraw")
-        Balance.objects.filter(id=b.id).update(created_at=self.solved[1].created_at - timedelta(seconds=1))
+        with patch('django.utils.timezone.now', return_value=self.solved[1].created_at - timedelta(seconds=1)):
+            Balance.objects.bulk_create([
+                Balance(miner=self.miners[0], balance=int(100e9), status="mature"),
+                Balance(miner=self.miners[0], balance=int(-50e9), status="withdraw"),
+            ])
 
-        balance_detail_content = Balance.objects.filter(created_at__lte=self.solved[1].created_at). \
-            to_csv().decode('utf-8')
+        balance_detail_content = Balance.objects.filter(created_at__lte=self.solved[1].created_at).to_csv()
 
         aggregate()
 
-        for miner in Miner.objects.all()[1:]:
-            self.assertEqual(Balance.objects.filter(miner=miner, status="mature", balance=int(60e9)).count(), 1)
-            self.assertEqual(Balance.objects.filter(miner=miner, status="withdraw", balance=int(-20e9)).count(), 1)
-
-        self.assertEqual(
-            Balance.objects.filter(miner=Miner.objects.all()[0], status="mature", balance=int(160e9)).count(), 1)
-        self.assertEqual(
-            Balance.objects.filter(miner=Miner.objects.all()[0], status="withdraw", balance=int(-70e9)).count(), 1)
+        expected = {(miner.public_key, balance): 1
+                    for miner in self.miners[1:] for balance in [int(60e9), int(-20e9)]}
+        expected.update({(self.miners[0].public_key, int(160e9)): 1, (self.miners[0].public_key, int(-70e9)): 1})
+        self.assertEqual(get_balance_counts(share=None, status__in=["mature", "withdraw"]), expected)
 
         for solved in self.solved[2:]:
-            for miner in Miner.objects.all():
-                self.assertEqual(Balance.objects.filter(share=solved, miner=miner, status="mature",
-                                                        balance=int(30e9)).count(), 1)
-                self.assertEqual(Balance.objects.filter(share=solved, miner=miner, status="withdraw",
-                                                        balance=int(-10e9)).count(), 1)
-
-        for filename, expected_content in [(self.balance_detail_file, balance_detail_content)]:
-            self.assertTrue(os.path.exists(filename))
-            with open(filename, 'r') as file:
-                content = sorted(file.read().split('\n'))
-                self.assertEqual(sorted(expected_content.split('\n')), content)
+            self.assertEqual(get_balance_counts(share=solved, status="mature"),
+                             {(miner.public_key, int(30e9)): 1 for miner in self.miners})
+            self.assertEqual(get_balance_counts(share=solved, status="withdraw"),
+                             {(miner.public_key, int(-10e9)): 1 for miner in self.miners})
+
+        self.assert_csv_content(self.balance_detail_file, balance_detail_content)
 
     @override_settings(KEEP_BALANCE_WITH_DETAIL_NUM=0)
     def test_balance_all_with_detail_no_detail_remain(self, mocked_time):
         """
         no detail should remain, all should be aggregated
         """
-        mocked_time.now.return_value = datetime.strptime('2020-01-27 12:19:46.196633',
-                                                         '%Y-%m-%d %H:%M:%S.%f')
+        mocked_time.now.return_value = self.NOW
         balance_detail_content = []
         settings.KEEP_BALANCE_WITH_DETAIL_NUM = 0
 
-        balance_detail_content = Balance.objects.all().to_csv().decode('utf-8')
+        balance_detail_content = Balance.objects.all().to_csv()
 
         aggregate()
 
-        for miner in Miner.objects.all():
-            self.assertEqual(Balance.objects.filter(miner=miner, status="mature", balance=int(300e9)).count(), 1)
-            self.assertEqual(Balance.objects.filter(miner=miner, status="withdraw", balance=int(-100e9)).count(), 1)
-
-        for solved in self.solved:
-            for miner in Miner.objects.all():
-                self.assertEqual(Balance.objects.filter(share=solved, miner=miner, status="mature",
-                                                        balance=int(30e9)).count(), 0)
-                self.assertEqual(Balance.objects.filter(share=solved, miner=miner, status="withdraw",
-                                                        balance=int(-10e9)).count(), 0)
-
-        for filename, expected_content in [(self.balance_detail_file, balance_detail_content)]:
-            self.assertTrue(os.path.exists(filename))
-            with open(filename, 'r') as file:
-                content = sorted(file.read().split('\n'))
-                self.assertEqual(sorted(expected_content.split('\n')), content)
+        self.assertEqual(get_balance_counts(share=None, status__in=["mature", "withdraw"]),
+                         {(miner.public_key, balance): 1
+                          for miner in self.miners for balance in [int(300e9), int(-100e9)]})
+
+        self.assertEqual(get_balance_counts(share__in=self.solved, status__in=["mature", "withdraw"]), {})
+
+        self.assert_csv_content(self.balance_detail_file, balance_detail_content)
 
     def test_balance_all_with_detail_with_immature_and_pending(self, mocked_time):
         """
         no detail should remain, all should be aggregated
         immature and pending balances should remain the same
         """
-        mocked_time.now.return_value = datetime.strptime('2020-01-27 12:19:46.196633',
-                                                         '%Y-%m-%d %H:%M:%S.%f')
+        mocked_time.now.return_value = self.NOW
         balance_detail_content = []
 
         for file in [self.balance_detail_file]:
             if os.path.exists(file):
                 os.remove(file)
 
-        b = Balance.objects.create(miner=Miner.objects.all()[0], balance=int(100e9), status="immature")
-        Balance.objects.filter(id=b.id).update(created_at=self.solved[1].created_at - timedelta(seconds=1))
-        b = Balance.objects.create(miner=Miner.objects.all()[0], balance=int(-50e9), status="pending_withdrawal")
-        Balance.objects.filter(id=b.id).update(created_at=self.solved[1].created_at - timedelta(seconds=1))
+        with patch('django.utils.timezone.now', return_value=self.solved[1].created_at - timedelta(seconds=1)):
+            Balance.objects.bulk_create([
+                Balance(miner=self.miners[0], balance=int(100e9), status="immature"),
+                Balance(miner=self.miners[0], balance=int(-50e9), status="pending_withdrawal"),
+            ])
 
         balance_detail_content = Balance.objects.filter(created_at__lte=self.solved[1].created_at,
-                                                        status__in=["mature", "withdraw"]).to_csv().decode('utf-8')
+                                                        status__in=["mature", "withdraw"]).to_csv()
         aggregate()
 
         self.assertEqual(Balance.objects.filter(status="pending_withdrawal").count(), 1)
         self.assertEqual(Balance.objects.filter(status="immature").count(), 1)
 
-        for miner in Miner.objects.all():
-            self.assertEqual(Balance.objects.filter(miner=miner, status="mature", balance=int(60e9)).count(), 1)
-            self.assertEqual(Balance.objects.filter(miner=miner, status="withdraw", balance=int(-20e9)).count(), 1)
+        self.assertEqual(get_balance_counts(share=None, status__in=["mature", "withdraw"]),
+                         {(miner.public_key, balance): 1
+                          for miner in self.miners for balance in [int(60e9), int(-20e9)]})
 
         for solved in self.solved[2:]:
-            for miner in Miner.objects.all():
-                self.assertEqual(Balance.objects.filter(share=solved, miner=miner, status="mature",
-                                                        balance=int(30e9)).count(), 1)
-                self.assertEqual(Balance.objects.filter(share=solved, miner=miner, status="withdraw",
-                                                        balance=int(-10e9)).count(), 1)
-
-        for filename, expected_content in [(self.balance_detail_file, balance_detail_content)]:
-            self.assertTrue(os.path.exists(filename))
-            with open(filename, 'r') as file:
-                content = sorted(file.read().split('\n'))
-                self.assertEqual(sorted(expected_content.split('\n')), content)
+            self.assertEqual(get_balance_counts(share=solved, status="mature"),
+                             {(miner.public_key, int(30e9)): 1 for miner in self.miners})
+            self.assertEqual(get_balance_counts(share=solved, status="withdraw"),
+                             {(miner.public_key, int(-10e9)): 1 for miner in self.miners})
+
+        self.assert_csv_content(self.balance_detail_file, balance_detail_content)
 
     def tearDown(self):
-        Configuration.objects.all().delete()
-        Miner.objects.all().delete()
-        Share.objects.all().delete()
-        Balance.objects.all().delete()
-        AggregateShare.objects.all().delete()
         for file in [self.balance_detail_file, self.shares_detail_file, self.shares_aggregate_file]:
             if os.path.exists(file):
                 os.remove(file)
@@ -3006,14 +2794,6 @@ class GetMinerAddressTestCase(TestCase):
         address = get_miner_payment_address(self.miner)
         self.assertEqual(address, selected.address)
 
-    def tearDown(self):
-        Configuration.objects.all().delete()
-        Miner.objects.all().delete()
-        Address.objects.all().delete()
-        Share.objects.all().delete()
-        AggregateShare.objects.all().delete()
-        Balance.objects.all().delete()
-
 
 class GetMinerAddressTestCase(TestCase):
     """
@@ -3045,10 +2825,6 @@ class GetMinerAddressTestCase(TestCase):
         self.assertEqual(ExtraInfo.objects.filter(key='ERGO_PRICE_BTC', value='10.1').count(), 1)
         self.assertEqual(ExtraInfo.objects.filter(key='ERGO_PRICE_USD', value='11.1').count(), 1)
 
-    def tearDown(self):
-        Configuration.objects.all().delete()
-        ExtraInfo.objects.all().delete()
-
 
 class PeriodicVerifyBlocks(TestCase):
     """
@@ -3094,15 +2870,15 @@ class PeriodicVerifyBlocks(TestCase):
             'status': 'error'
         }
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
         Create 1 miner and 10 shares with specific transaction_id and block_height
         :return:
         """
         miner = Miner.objects.create(public_key='1')
-        for x in range(10):
-            Share.objects.create(miner=miner, transaction_id=str(x), difficulty=1, block_height=str(x),
-                                 status='solved', parent_id='1')
+        Share.objects.bulk_create([Share(miner=miner, transaction_id=str(x), difficulty=1, block_height=str(x),
+                                         status='solved', parent_id='1') for x in range(10)])
 
     @patch('core.tasks.node_request', side_effect=mocked_node_request)
     def test_verify_blocks(self, mock_node):
@@ -3114,23 +2890,13 @@ class PeriodicVerifyBlocks(TestCase):
         :return:
         """
         periodic_verify_blocks()
-        shares = Share.objects.all().order_by('transaction_id')
-        self.assertIsNone(shares[9].transaction_valid)
-        self.assertFalse(shares[8].transaction_valid)
-        self.assertFalse(shares[7].transaction_valid)
-        self.assertIsNone(shares[6].transaction_valid)
+        shares = list(Share.objects.order_by('transaction_id').values_list('transaction_valid', flat=True))
+        self.assertIsNone(shares[9])
+        self.assertFalse(shares[8])
+        self.assertFalse(shares[7])
+        self.assertIsNone(shares[6])
         for x in range(5, -1, -1):
-            self.assertTrue(shares[x].transaction_valid)
-
-    def tearDown(self):
-        """
-        tearDown function to clean up objects created in setUp function
-        :return:
-        """
-        Configuration.objects.all().delete()
-        Miner.objects.all().delete()
-        Share.objects.all().delete()
-        Balance.objects.all().delete()
+            self.assertTrue(shares[x])
 
 
 class AdministratorUserTestCase(TestCase):
@@ -3147,28 +2913,30 @@ class AdministratorUserTestCase(TestCase):
     }
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """
-        Create 4 miners and set miner ip for them so call 10 shares for every miners and set authenticate.
+        Create 4 miners and set miner ip for them so call 10 shares for every miners and the user.
         :return:
         """
-        for i in range(1, 5):
-            Miner.objects.create(public_key=i, ip='127.0.0.{}'.format(i))
-
-        miner = Miner.objects.all()
+        miner = Miner.objects.bulk_create([Miner(public_key=i, ip='127.0.0.{}'.format(i)) for i in range(1, 5)])
 
+        shares = []
         for x in range(10):
-            Share.objects.create(miner=miner[0], transaction_id=str(x), difficulty=10000, block_height=str(x),
-                                 status='solved', parent_id='1')
-            Share.objects.create(miner=miner[1], transaction_id=str(x), difficulty=10000, block_height=str(x),
-                                 status='invalid', parent_id='1')
-            Share.objects.create(miner=miner[2], transaction_id=str(x), difficulty=10000, block_height=str(x),
-                                 status='repetitious', parent_id='1')
-            Share.objects.create(miner=miner[3], transaction_id=str(x), difficulty=20000, block_height=str(x),
-                                 status='valid', parent_id='1')
+            shares += [Share(miner=miner[0], transaction_id=str(x), difficulty=10000, block_height=str(x),
+                             status='solved', parent_id='1'),
+                       Share(miner=miner[1], transaction_id=str(x), difficulty=10000, block_height=str(x),
+                             status='invalid', parent_id='1'),
+                       Share(miner=miner[2], transaction_id=str(x), difficulty=10000, block_height=str(x),
+                             status='repetitious', parent_id='1'),
+                       Share(miner=miner[3], transaction_id=str(x), difficulty=20000, block_height=str(x),
+                             status='valid', parent_id='1')]
+        Share.objects.bulk_create(shares)
+        User.objects.create_user(username='test', password='test')
+
+    def setUp(self):
         # set session authenticate
         self.factory = RequestFactory()
-        User.objects.create_user(username='test', password='test')
         self.client = APIClient()
         self.client.login(username='test', password='test')
 
@@ -3179,8 +2947,7 @@ class AdministratorUserTestCase(TestCase):
         # Call route /administrator/users/
         response = self.client.get('/administrator/users/').json()
         # Expected output
-        with open("core/data_testing/administrator_user_normal.json", "r") as read_file:
-            file = json.load(read_file)
+        file = read_test_data("administrator_user_normal.json")
 
         self.assertEqual(response, file)
 
@@ -3197,8 +2964,7 @@ class AdministratorUserTestCase(TestCase):
         }
         response = self.client.get('/administrator/users/', data, content_type='application/json').json()
         # Expected output
-        with open("core/data_testing/administrator_user_query_1.json", "r") as read_file:
-            file = json.load(read_file)
+        file = read_test_data("administrator_user_query_1.json")
 
         self.assertEqual(response, file)
 
@@ -3215,8 +2981,7 @@ class AdministratorUserTestCase(TestCase):
         }
         response = self.client.get('/administrator/users/', data, content_type='application/json').json()
         # Expected output
-        with open("core/data_testing/administrator_user_query_2.json", "r") as read_file:
-            file = json.load(read_file)
+        file = read_test_data("administrator_user_query_2.json")
 
         self.assertEqual(response, file)
 
@@ -3238,7 +3003,7 @@ class AdministratorUserTestCase(TestCase):
         tz = get_current_timezone()
         today = timezone.datetime.fromtimestamp(today.timestamp(), tz=tz)
         yesterday = timezone.datetime.fromtimestamp(yesterday.timestamp(), tz=tz)
-        miners = Miner.objects.all()
+        miners = list(Miner.objects.all())
         tx1 = Transaction.objects.create(tx_id='id', tx_body='{}', is_confirmed=False)
         tx1.created_at = today
         tx1.save()
@@ -3261,7 +3026,7 @@ class AdministratorUserTestCase(TestCase):
         tz = get_current_timezone()
         today = timezone.datetime.fromtimestamp(today.timestamp(), tz=tz)
         yesterday = timezone.datetime.fromtimestamp(yesterday.timestamp(), tz=tz)
-        miners = Miner.objects.all()
+        miners = list(Miner.objects.all())
         tx1 = Transaction.objects.create(tx_id='id', tx_body='{}', is_confirmed=False)
         tx1.created_at = today
         tx1.save()
@@ -3284,23 +3049,25 @@ class AdministratorUserTestCase(TestCase):
 time_now = [timezone.now()]
 
 
-class LoginTestCase(TransactionTestCase):
-    reset_sequences = True
-    TIME = time_now
-    DEVICE_CONFIG = getattr(settings, "DEVICE_CONFIG")
-    DEFAULT_TOKEN_EXPIRE = getattr(settings, 'DEFAULT_TOKEN_EXPIRE')
+def mocked_verify_recaptcha(*args, **kwargs):
+    return {'success': True}
 
-    def mocked_verify_recaptcha(*args, **kwargs):
-        return {'success': True}
 
-    def mocked_verify_token(*args, **kwargs):
-        if args[0] == '1234':
-            return True
-        if args[0] == '4321':
-            return False
+def mocked_verify_token(*args, **kwargs):
+    if args[0] == '1234':
+        return True
+    if args[0] == '4321':
+        return False
 
-    def mocked_time(*args, **kwargs):
-        return time_now[0]
+
+def mocked_time(*args, **kwargs):
+    return time_now[0]
+
+
+class LoginTestCase(TestCase):
+    TIME = time_now
+    DEVICE_CONFIG = getattr(settings, "DEVICE_CONFIG")
+    DEFAULT_TOKEN_EXPIRE = getattr(settings, 'DEFAULT_TOKEN_EXPIRE')
 
     @patch('core.utils.verify_recaptcha', side_effect=mocked_verify_recaptcha)
     def test_valid_first_login(self, mock_verify_recaptcha):
@@ -3473,8 +3240,7 @@ class LoginTestCase(TransactionTestCase):
         self.assertEqual(response.json(), {'detail': 'Expired token.'})
 
 
-class TOTPTestCase(TransactionTestCase):
-    reset_sequences = True
+class TOTPTestCase(TestCase):
     DEVICE_CONFIG = getattr(settings, "DEVICE_CONFIG")
 
     def test_QR_first_device(self):
@@ -3523,8 +3289,7 @@ class TOTPTestCase(TransactionTestCase):
         self.assertNotEqual(qrcode, response['qrcode'])
 
 
-class UIDataTestCase(TransactionTestCase):
-    reset_sequences = True
+class UIDataTestCase(TestCase):
     DEFAULT_UI_PREFIX_DIRECTORY = getattr(settings, 'DEFAULT_UI_PREFIX_DIRECTORY')
 
     def setUp(self):
@@ -3535,13 +3300,13 @@ class UIDataTestCase(TransactionTestCase):
         token = Token.objects.create(user=user)
         self.token = token
 
-    @patch("builtins.open", new_callable=mock_open)
+    @patch("core.views.open", new_callable=mock_open, create=True)
     def test_patch_get(self, mock_file):
         self.client.get('/ui/test/about/', **{'HTTP_source-ip': '127.0.0.1'}).json()
         mock_file.assert_called_with(os.path.join(self.DEFAULT_UI_PREFIX_DIRECTORY, 'test/about'), 'r')
 
     @patch("os.makedirs")
-    @patch("builtins.open", new_callable=mock_open)
+    @patch("core.views.open", new_callable=mock_open, create=True)
     def test_patch_post(self, mock_file, mock_make_dir):
         # Set token for send request
         client = APIClient()
@@ -3747,7 +3512,6 @@ class PaymentViewTestCase(TestCase):
     """
 
     def setUp(self):
-        self.client = Client()
         Configuration.objects.create(key='DEFAULT_WITHDRAW_THRESHOLD', value=str(int(1e8)))
         for i in range(3):
             Miner.objects.create(public_key=str(i))
@@ -93,12 +93,14 @@ class RewardAlgorithm(metaclass=abc.ABCMeta):
         calculates real reward to share between shares of a round
         :return: real reward to be shared
         """
+        configurations = Configuration.objects.snapshot('REWARD_FACTOR', 'REWARD_FACTOR_PRECISION', 'TOTAL_REWARD',
+                                                        'FEE_FACTOR')
         # total reward considering pool fee and reward factor
-        REWARD_FACTOR = Configuration.objects.REWARD_FACTOR
-        PRECISION = Configuration.objects.REWARD_FACTOR_PRECISION
-        TOTAL_REWARD = round((Configuration.objects.TOTAL_REWARD / 1e9) * REWARD_FACTOR, PRECISION)
+        REWARD_FACTOR = configurations['REWARD_FACTOR']
+        PRECISION = configurations['REWARD_FACTOR_PRECISION']
+        TOTAL_REWARD = round((configurations['TOTAL_REWARD'] / 1e9) * REWARD_FACTOR, PRECISION)
         TOTAL_REWARD = int(TOTAL_REWARD * 1e9)
-        return int(TOTAL_REWARD * (1 - Configuration.objects.FEE_FACTOR))
+        return int(TOTAL_REWARD * (1 - configurations['FEE_FACTOR']))
 
     def get_miner_shares(self, shares):
         """
@@ -187,13 +189,15 @@ class PPS(RewardAlgorithm):
         calculates real reward to share between shares of a round
         :return: real reward to be shared
         """
+        configurations = Configuration.objects.snapshot('REWARD_FACTOR', 'REWARD_FACTOR_PRECISION', 'TOTAL_REWARD',
+                                                        'FEE_FACTOR', 'POOL_BASE_FACTOR')
         # total reward considering pool fee and reward factor
-        REWARD_FACTOR = Configuration.objects.REWARD_FACTOR
-        PRECISION = Configuration.objects.REWARD_FACTOR_PRECISION
-        TOTAL_REWARD = round((Configuration.objects.TOTAL_REWARD / 1e9) * REWARD_FACTOR, PRECISION)
+        REWARD_FACTOR = configurations['REWARD_FACTOR']
+        PRECISION = configurations['REWARD_FACTOR_PRECISION']
+        TOTAL_REWARD = round((configurations['TOTAL_REWARD'] / 1e9) * REWARD_FACTOR, PRECISION)
         TOTAL_REWARD = int(TOTAL_REWARD * 1e9)
-        SOLUTION_REWARD = int(TOTAL_REWARD * (1 - Configuration.objects.FEE_FACTOR))
-        return SOLUTION_REWARD / Configuration.objects.POOL_BASE_FACTOR
+        SOLUTION_REWARD = int(TOTAL_REWARD * (1 - configurations['FEE_FACTOR']))
+        return SOLUTION_REWARD / configurations['POOL_BASE_FACTOR']
 
 
 class Prop(RewardAlgorithm):
@@ -80,7 +80,7 @@ class ShareView(viewsets.GenericViewSet,
             miner = Miner.objects.create(public_key=serializer.validated_data['miner'].lower())
         _share = serializer.validated_data['share']
         _status = serializer.validated_data['status']
-        rep_share = Share.objects.filter(share=_share)
+        rep_share = Share.objects.filter(share=_share).exists()
 
         if not rep_share:
             logger.info('New share, saving.')
@@ -89,24 +89,27 @@ class ShareView(viewsets.GenericViewSet,
                     address=serializer.validated_data.get('miner_address'),
                     address_miner=miner, category='miner'
                 )
-                # updating updated_at field
-                miner_address.save()
+                # updating updated_at field, a new address already has it
+                if not miner_created:
+                    miner_address.save()
                 # Check if miner_address already existed, ignore create lock_address, withdraw_address.
                 if miner_created:
                     lock_address, lock_created = \
                         Address.objects.get_or_create(address=serializer.validated_data.get('lock_address'),
                                                       address_miner=miner,
                                                       category='lock')
-                    # updating updated_at field
-                    lock_address.save()
+                    # updating updated_at field, a new address already has it
+                    if not lock_created:
+                        lock_address.save()
                     # Check if lock_address already existed, ignore create withdraw_address.
                     if lock_created:
                         withdraw_address, withdraw_created = \
                             Address.objects.get_or_create(address=serializer.validated_data.get('withdraw_address'),
                                                           address_miner=miner,
                                                           category='withdraw')
-                        # updating updated_at field
-                        withdraw_address.save()
+                        # updating updated_at field, a new address already has it
+                        if not withdraw_created:
+                            withdraw_address.save()
                         serializer.save(miner=miner, withdraw_address=withdraw_address, miner_address=miner_address,
                                         lock_address=lock_address)
                     else:
@@ -123,8 +126,9 @@ class ShareView(viewsets.GenericViewSet,
             if _status != 'invalid':
                 miner_address, miner_created = Address.objects.get_or_create(
                     address=serializer.validated_data.get('miner_address'), address_miner=miner, category='miner')
-                # updating updated_at field
-                miner_address.save()
+                # updating updated_at field, a new address already has it
+                if not miner_created:
+                    miner_address.save()
                 serializer.save(
                     status="repetitious", miner=miner, withdraw_address=None, miner_address=miner_address,
                     lock_address=None
@@ -136,7 +140,7 @@ class ShareView(viewsets.GenericViewSet,
             _status = "repetitious"
         if _status in ["solved", "valid"]:
             logger.info('Solved share, saving.')
-            RewardAlgorithm.get_instance().perform_logic(Share.objects.get(share=_share))
+            RewardAlgorithm.get_instance().perform_logic(serializer.instance)
 
 
 class BalanceView(viewsets.GenericViewSet,
@@ -518,7 +522,8 @@ class UserApiViewSet(viewsets.GenericViewSet,
             ))
         ).order_by('public_key')
 
-        round_share = round_shares.first() or {}
+        round_shares = list(round_shares)
+        round_share = round_shares[0] if round_shares else {}
         logger.info('Get user params for miner: {}'.format(round_share.get('public_key') if user_pk else None))
         response = {}
         temp = {}
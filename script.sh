@@ -1,3 +1,4 @@
 #!/bin/bash
-coverage run --omit="*/migrations/*","*/wsgi.py","*/urls.py","*/settings.py","*/production.py" --source=core,ErgoAccounting manage.py test -v 2
-coverage report --fail-under=85
\ No newline at end of file
+coverage run manage.py test --keepdb --parallel -v 2
+coverage combine
+coverage report --fail-under=85